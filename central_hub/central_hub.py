@@ -9,28 +9,39 @@ Includes local components for control logic:
 - Watcher: Monitor variables and trigger actions on expression changes
 - WebServer: WebSocket server exposing local components (same API as ESP32s)
 
-Designed to run on a Raspberry Pi (or any Python 3.8+ environment).
+Designed to run on a Raspberry Pi (or any Python 3.10+ environment).
 """
 
 import asyncio
-import json
 import logging
 import os
+import queue
 import socket
+import sys
+import time
+import zlib
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
+import orjson
 import websockets
 from websockets.client import WebSocketClientProtocol
 
+try:
+    import uvloop  # Faster libuv-based event loop (optional, not on Windows)
+except ImportError:
+    uvloop = None
+
 from config import (
-    ESP32_DEVICES, WS_PING_INTERVAL, WS_PING_TIMEOUT, 
-    RECONNECT_DELAY, DISCOVERY_DELAY, SUBSCRIBE_DELAY, LOG_LEVEL,
-    WS_SERVER_PORT
+    ESP32_DEVICES, TCP_KEEPALIVE_IDLE, TCP_KEEPALIVE_INTERVAL, 
+    TCP_KEEPALIVE_COUNT, RECONNECT_DELAY, MAX_IN_FLIGHT, LOG_LEVEL,
+    WS_SERVER_PORT, BATCH_SIZE, UPDATE_BUS_SIZE, PENDING_SLOTS
 )
 from components import (
     Component as BaseComponent,
+    BaseParameter,
     NetworkActionsComponent,
     ActionManagerComponent, 
     WatcherComponent,
@@ -46,7 +57,35 @@ logging.basicConfig(
 logger = logging.getLogger('CentralHub')
 
 
-@dataclass
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so there is no need to pre-format for pickling
+        return record
+
+
+def _start_background_logging() -> QueueListener:
+    """Move root log handlers onto a background thread fed by a queue."""
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+# Anchor pair for turning monotonic timestamps back into wall-clock time
+_WALL_EPOCH = time.time()
+_MONO_EPOCH_NS = time.monotonic_ns()
+
+
+def _wall_time(monotonic_ns: int) -> datetime:
+    """Convert a time.monotonic_ns() reading to a local datetime."""
+    return datetime.fromtimestamp(_WALL_EPOCH + (monotonic_ns - _MONO_EPOCH_NS) / 1e9)
+
+
+@dataclass(slots=True)
 class Parameter:
     """Represents a single parameter from an ESP32 component."""
     param_id: int
@@ -57,54 +96,213 @@ class Parameter:
     read_only: bool
     min_val: Optional[float] = None
     max_val: Optional[float] = None
-    values: Dict[tuple, Any] = field(default_factory=dict)  # (row, col) -> value
-    last_updated: Optional[datetime] = None
+    values: List[Any] = field(default_factory=list)  # row-major, rows * cols cells (None = not yet received)
+    last_updated_ns: int = 0  # time.monotonic_ns() of last update, 0 = never
+    # Push-update handler (row, col, value) built by the hub once the parameter is discovered
+    apply: Optional[Callable[[int, int, Any], None]] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.values:
+            self.values = [None] * (self.rows * self.cols)
+    
+    def _index(self, row: int, col: int) -> Optional[int]:
+        """Flat index of a cell, or None if out of range."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return None
     
     def set_value(self, row: int, col: int, value: Any):
         """Update a value and timestamp."""
-        self.values[(row, col)] = value
-        self.last_updated = datetime.now()
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        self.values[idx] = value
+        self.last_updated_ns = time.monotonic_ns()
     
     def get_value(self, row: int = 0, col: int = 0) -> Any:
         """Get a value, defaulting to (0,0)."""
-        return self.values.get((row, col))
+        idx = self._index(row, col)
+        return None if idx is None else self.values[idx]
+    
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        """Wall-clock time of the last update, or None if never updated."""
+        return _wall_time(self.last_updated_ns) if self.last_updated_ns else None
+    
+    def to_rows(self) -> List[List[Any]]:
+        """Values as a rows x cols list of lists."""
+        values, cols = self.values, self.cols
+        return [values[start:start + cols] for start in range(0, len(values), cols)]
+    
+    def items(self):
+        """Yield ((row, col), value) for every cell that has received a value."""
+        cols = self.cols
+        for idx, value in enumerate(self.values):
+            if value is not None:
+                yield divmod(idx, cols), value
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Represents a component on an ESP32 device."""
     name: str
     parameters: Dict[str, Parameter] = field(default_factory=dict)
     params_by_id: Dict[int, Parameter] = field(default_factory=dict)
+    device: Optional['ESP32Device'] = field(default=None, repr=False)  # Owning device, if any
     
     def add_parameter(self, param: Parameter):
-        """Add a parameter to this component."""
+        """Add a parameter to this component (and to the owning device's index)."""
         self.parameters[param.name] = param
         self.params_by_id[param.param_id] = param
+        if self.device is not None:
+            self.device.params_by_id[param.param_id] = (self, param)
     
     def get_param_by_id(self, param_id: int) -> Optional[Parameter]:
         """Look up parameter by ID."""
         return self.params_by_id.get(param_id)
 
 
-@dataclass 
+class WSDispatcher:
+    """
+    Request/response plumbing for one device WebSocket.
+    
+    Owns the pending-request slots (a request's message ID is its slot index)
+    and the in-flight limit. request() and batch() send and wait; the device's
+    listener task hands every incoming frame to dispatch().
+    """
+    
+    def __init__(self, ip: str):
+        self.ip = ip
+        self.websocket: Optional[WebSocketClientProtocol] = None
+        self.inflight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self._pending: List[Optional[asyncio.Future]] = [None] * PENDING_SLOTS
+        self._next_slot = 0
+    
+    def attach(self, websocket: WebSocketClientProtocol):
+        """Start sending requests over a newly connected WebSocket."""
+        self.websocket = websocket
+    
+    def detach(self):
+        """Stop using the WebSocket and fail any requests still waiting on it."""
+        self.websocket = None
+        for msg_id, future in enumerate(self._pending):
+            if future is not None:
+                self._pending[msg_id] = None
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+    
+    def _register(self, future: asyncio.Future) -> int:
+        """Store a future in a free slot and return the slot index as its message ID."""
+        slots = self._pending
+        for _ in range(PENDING_SLOTS):
+            msg_id = self._next_slot
+            self._next_slot = (msg_id + 1) % PENDING_SLOTS
+            if slots[msg_id] is None:
+                slots[msg_id] = future
+                return msg_id
+        raise RuntimeError(f"More than {PENDING_SLOTS} requests outstanding")
+    
+    def _release(self, msg_id: int, future: asyncio.Future):
+        """Free a slot if it still holds this future."""
+        if self._pending[msg_id] is future:
+            self._pending[msg_id] = None
+    
+    def _resolve(self, data: dict) -> bool:
+        """Complete the pending request matching this response's ID, if any."""
+        msg_id = data.get('id')
+        if type(msg_id) is not int or not 0 <= msg_id < PENDING_SLOTS:
+            return False
+        future = self._pending[msg_id]
+        if future is None:
+            return False
+        self._pending[msg_id] = None
+        if not future.done():
+            future.set_result(data)
+        return True
+    
+    def dispatch(self, data: dict) -> bool:
+        """Route a response (or batch of responses) to its waiters. False if not a response."""
+        if data.get('type') == 'batch':
+            for response in data.get('responses', ()):
+                self._resolve(response)
+            return True
+        return self._resolve(data)
+    
+    async def request(self, message: dict, timeout: float = 10.0) -> dict:
+        """Send a request and wait for its response."""
+        if not self.websocket:
+            raise ConnectionError("Not connected")
+        
+        future = asyncio.get_running_loop().create_future()
+        # Slots are claimed only once in flight, so at most MAX_IN_FLIGHT * BATCH_SIZE
+        # are held however many requests are started at once
+        async with self.inflight:
+            msg_id = self._register(future)
+            message['id'] = msg_id
+            try:
+                payload = orjson.dumps(message)
+                logger.debug(f"[{self.ip}] Sending: {message}")
+                await self.websocket.send(payload)
+                response = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"[{self.ip}] Request timeout for: {message}")
+                raise
+            finally:
+                self._release(msg_id, future)
+        logger.debug(f"[{self.ip}] Received: {response}")
+        return response
+    
+    async def batch(self, messages: List[dict], timeout: float = 10.0) -> List[dict]:
+        """
+        Send several requests in a single batch frame and wait for all responses.
+        
+        Each inner message gets its own ID and future; dispatch() fans the
+        batch response back out to them. Returns responses in request order.
+        """
+        if not self.websocket:
+            raise ConnectionError("Not connected")
+        
+        loop = asyncio.get_running_loop()
+        waiting: List[Tuple[int, asyncio.Future]] = []
+        async with self.inflight:  # Before claiming slots, as in request()
+            try:
+                for message in messages:
+                    future = loop.create_future()
+                    message['id'] = self._register(future)
+                    waiting.append((message['id'], future))
+                
+                payload = orjson.dumps({'type': 'batch', 'msgs': messages})
+                logger.debug(f"[{self.ip}] Sending batch of {len(messages)} requests")
+                await self.websocket.send(payload)
+                return await asyncio.wait_for(
+                    asyncio.gather(*(future for _, future in waiting)), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"[{self.ip}] Batch request timeout ({len(messages)} requests)")
+                raise
+            finally:
+                for msg_id, future in waiting:
+                    self._release(msg_id, future)
+
+
+@dataclass(slots=True)
 class ESP32Device:
     """Represents a connected ESP32 device."""
     ip: str
     name: str = ""
     components: Dict[str, Component] = field(default_factory=dict)
+    params_by_id: Dict[int, Tuple[Component, Parameter]] = field(default_factory=dict)  # across all components
     connected: bool = False
+    catalog_version: Optional[int] = None  # From get_catalog_version at last discovery
     websocket: Optional[WebSocketClientProtocol] = None
-    message_id: int = 0
-    pending_requests: Dict[int, asyncio.Future] = field(default_factory=dict)
+    dispatcher: WSDispatcher = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.dispatcher = WSDispatcher(self.ip)
     
-    def get_param_by_id(self, param_id: int) -> Optional[tuple]:
+    def get_param_by_id(self, param_id: int) -> Optional[Tuple[Component, Parameter]]:
         """Find parameter by ID across all components. Returns (component, param) or None."""
-        for comp in self.components.values():
-            param = comp.get_param_by_id(param_id)
-            if param:
-                return (comp, param)
-        return None
+        return self.params_by_id.get(param_id)
 
 
 class CentralHub:
@@ -121,13 +319,19 @@ class CentralHub:
         self.ws_port = ws_port
         self.devices: Dict[str, ESP32Device] = {}  # ip -> device
         self.running = False
+        self._stop_event = asyncio.Event()  # Set by stop(); keeps start() alive until then
         
         # Local components for control logic
         self.local_components: Dict[str, BaseComponent] = {}
+        self.local_params_by_id: Dict[int, BaseParameter] = {}  # across all local components
+        
+        # Pseudo-IDs for local components (the WebServer API identifies components by ID)
+        self.local_component_ids: Dict[str, int] = {}
+        self.local_components_by_id: Dict[int, BaseComponent] = {}
         
-        # Cache for remote parameter values (used by Watcher)
-        # Format: { "ip": { "Component.param[row,col]": value } }
-        self.remote_state_cache: Dict[str, Dict[str, Any]] = {}
+        # Remote parameter changes, consumed by Watcher
+        # Events: (ip, component_name, param_name, row, col, value)
+        self.update_bus: asyncio.Queue = asyncio.Queue(maxsize=UPDATE_BUS_SIZE)
         
         # Initialize local components
         self._init_local_components()
@@ -146,9 +350,13 @@ class CentralHub:
         self.local_components['Watcher'] = self.watcher
         self.local_components['WebServer'] = self.web_server
         
-        # Set hub reference on each component
-        for comp in self.local_components.values():
+        # Set hub reference on each component and index it and its parameters
+        for name, comp in self.local_components.items():
             comp.hub = self
+            self.local_params_by_id.update(comp.params_by_id)
+            comp_id = zlib.crc32(name.encode())  # Stable across restarts, unlike hash()
+            self.local_component_ids[name] = comp_id
+            self.local_components_by_id[comp_id] = comp
         
         # Share nickname map between components
         # When ActionManager updates nicknames, Watcher should see them too
@@ -186,12 +394,8 @@ class CentralHub:
         # Create tasks for each ESP32 connection
         tasks = [self._manage_device(ip) for ip in self.esp32_ips]
         
-        # Also run a keep-alive task so the hub doesn't exit if no ESP32s configured
-        async def keep_alive():
-            while self.running:
-                await asyncio.sleep(1)
-        
-        tasks.append(keep_alive())
+        # Also wait on the stop event so the hub doesn't exit if no ESP32s configured
+        tasks.append(self._stop_event.wait())
         
         await asyncio.gather(*tasks, return_exceptions=True)
     
@@ -199,11 +403,13 @@ class CentralHub:
         """Stop the central hub."""
         logger.info("Stopping Central Hub")
         self.running = False
+        self._stop_event.set()
         
         # Stop local component background tasks
         await self.web_server.stop()
         await self.watcher.stop()
         await self.action_manager.stop()
+        await self.network_actions.stop()
         
         # Close all connections
         for device in self.devices.values():
@@ -235,8 +441,19 @@ class CentralHub:
         
         logger.info(f"[{ip}] Connecting to {uri}...")
         
-        async with websockets.connect(uri, ping_interval=WS_PING_INTERVAL, ping_timeout=WS_PING_TIMEOUT) as ws:
+        # ESP32 frames are small JSON; skip permessage-deflate and Nagle delays
+        async with websockets.connect(
+            uri,
+            ping_interval=None,  # Liveness is left to TCP keepalive
+            ping_timeout=None,
+            compression=None,
+            max_size=2**20,
+            max_queue=256,
+            write_limit=2**18,
+        ) as ws:
+            self._configure_socket(ws)
             device.websocket = ws
+            device.dispatcher.attach(ws)
             device.connected = True
             logger.info(f"[{ip}] Connected!")
             
@@ -244,8 +461,14 @@ class CentralHub:
             listener_task = asyncio.create_task(self._listen_for_updates(device))
             
             try:
-                # Discover all components and parameters
-                await self._discover_device(device)
+                # Discover all components and parameters, unless the catalog
+                # is unchanged since the last connection
+                version = await self._get_catalog_version(device)
+                if version is not None and version == device.catalog_version:
+                    logger.info(f"[{ip}] Catalog unchanged (version {version}), skipping discovery")
+                else:
+                    await self._discover_device(device)
+                    device.catalog_version = version
                 
                 # Subscribe to all parameters
                 await self._subscribe_all(device)
@@ -255,33 +478,28 @@ class CentralHub:
             except Exception as e:
                 listener_task.cancel()
                 raise
+            finally:
+                device.dispatcher.detach()
     
-    async def _send_request(self, device: ESP32Device, message: dict, timeout: float = 10.0) -> dict:
-        """Send a request and wait for response."""
-        if not device.websocket:
-            raise ConnectionError("Not connected")
-        
-        # Assign message ID
-        msg_id = device.message_id
-        device.message_id += 1
-        message['id'] = msg_id
-        
-        # Create future for response
-        future = asyncio.get_running_loop().create_future()
-        device.pending_requests[msg_id] = future
-        
-        try:
-            msg_str = json.dumps(message)
-            logger.debug(f"[{device.ip}] Sending: {msg_str}")
-            await device.websocket.send(msg_str)
-            response = await asyncio.wait_for(future, timeout=timeout)
-            logger.debug(f"[{device.ip}] Received: {response}")
-            return response
-        except asyncio.TimeoutError:
-            logger.error(f"[{device.ip}] Request timeout for: {message}")
-            raise
-        finally:
-            device.pending_requests.pop(msg_id, None)
+    def _configure_socket(self, ws):
+        """Tune the TCP socket underneath a device WebSocket."""
+        sock = ws.transport.get_extra_info('socket')
+        if sock is None:
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Probe timing options are platform-specific (TCP_KEEPIDLE is Linux-only)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE)
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL)
+        if hasattr(socket, 'TCP_KEEPCNT'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, TCP_KEEPALIVE_COUNT)
+    
+    async def _get_catalog_version(self, device: ESP32Device) -> Optional[int]:
+        """Ask the device for its catalog version; None if it doesn't support it."""
+        response = await device.dispatcher.request({'type': 'get_catalog_version'})
+        return response.get('version')
     
     async def _discover_device(self, device: ESP32Device):
         """Discover all components and parameters on a device."""
@@ -289,27 +507,30 @@ class CentralHub:
         logger.info(f"[{ip}] Discovering components...")
         
         # Get list of components
-        response = await self._send_request(device, {'type': 'get_components'})
+        response = await device.dispatcher.request({'type': 'get_components'})
         components_raw = response.get('components', [])
         
         # Components can be dicts {'name': 'X', 'id': Y} or just strings
         component_names = []
         for c in components_raw:
             if isinstance(c, dict):
-                component_names.append(c['name'])
+                component_names.append(sys.intern(c['name']))
             else:
-                component_names.append(c)
+                component_names.append(sys.intern(c))
         
         logger.info(f"[{ip}] Found {len(component_names)} components: {component_names}")
         
+        # Merge into the existing catalog: known components are reused, never removed
         for comp_name in component_names:
-            component = Component(name=comp_name)
-            device.components[comp_name] = component
-            
-            # Discover parameters for each type
-            for param_type in ['int', 'float', 'bool', 'str']:
-                await self._discover_params_of_type(device, component, param_type)
-                await asyncio.sleep(DISCOVERY_DELAY)  # Small delay to not overwhelm ESP32
+            if comp_name not in device.components:
+                device.components[comp_name] = Component(name=comp_name, device=device)
+        
+        # Discover parameters for every component/type pair concurrently
+        await asyncio.gather(*[
+            self._discover_params_of_type(device, device.components[comp_name], param_type)
+            for comp_name in component_names
+            for param_type in ('int', 'float', 'bool', 'str')
+        ])
         
         # Log summary
         total_params = sum(len(c.parameters) for c in device.components.values())
@@ -320,7 +541,7 @@ class CentralHub:
         ip = device.ip
         
         # Get count first
-        response = await self._send_request(device, {
+        response = await device.dispatcher.request({
             'type': 'get_param_info',
             'comp': component.name,
             'param_type': param_type,
@@ -331,22 +552,28 @@ class CentralHub:
         if count == 0:
             return
         
-        # Fetch each parameter
-        for idx in range(count):
-            response = await self._send_request(device, {
-                'type': 'get_param_info',
-                'comp': component.name,
-                'param_type': param_type,
-                'idx': idx
-            })
-            
+        # Fetch all parameters, BATCH_SIZE requests per frame
+        batches = await asyncio.gather(*[
+            device.dispatcher.batch([
+                {
+                    'type': 'get_param_info',
+                    'comp': component.name,
+                    'param_type': param_type,
+                    'idx': idx
+                }
+                for idx in range(start, min(start + BATCH_SIZE, count))
+            ])
+            for start in range(0, count, BATCH_SIZE)
+        ])
+        
+        for response in (r for batch in batches for r in batch):
             if 'name' not in response:
                 continue
             
             param = Parameter(
                 param_id=response.get('param_id', 0),
-                name=response['name'],
-                param_type=param_type,
+                name=sys.intern(response['name']),
+                param_type=sys.intern(param_type),
                 rows=response.get('rows', 1),
                 cols=response.get('cols', 1),
                 read_only=response.get('readOnly', False),
@@ -355,35 +582,55 @@ class CentralHub:
             )
             
             component.add_parameter(param)
-            await asyncio.sleep(DISCOVERY_DELAY)
+            param.apply = self._make_apply(device.ip, component, param)
     
     async def _subscribe_all(self, device: ESP32Device):
-        """Subscribe to all parameters on the device."""
+        """Subscribe to all parameters on the device, BATCH_SIZE cells per frame."""
         ip = device.ip
-        subscription_count = 0
-        
-        for comp in device.components.values():
-            for param in comp.parameters.values():
-                # Subscribe to each cell of the parameter
-                for row in range(param.rows):
-                    for col in range(param.cols):
-                        try:
-                            response = await self._send_request(device, {
-                                'type': 'subscribe',
-                                'param_id': param.param_id,
-                                'row': row,
-                                'col': col
-                            })
-                            
-                            # Store initial value
-                            if 'value' in response:
-                                param.set_value(row, col, response['value'])
-                            
-                            subscription_count += 1
-                            await asyncio.sleep(SUBSCRIBE_DELAY)  # Rate limit
-                            
-                        except Exception as e:
-                            logger.warning(f"[{ip}] Failed to subscribe to {comp.name}.{param.name}[{row}][{col}]: {e}")
+        
+        # Every (component, param, row, col) cell on the device
+        cells = [
+            (comp, param, row, col)
+            for comp in device.components.values()
+            for param in comp.parameters.values()
+            for row in range(param.rows)
+            for col in range(param.cols)
+        ]
+        
+        async def subscribe_chunk(chunk) -> int:
+            try:
+                responses = await device.dispatcher.batch([
+                    {
+                        'type': 'subscribe',
+                        'param_id': param.param_id,
+                        'row': row,
+                        'col': col
+                    }
+                    for _, param, row, col in chunk
+                ])
+            except Exception as e:
+                logger.warning(f"[{ip}] Failed to subscribe to batch of {len(chunk)} cells: {e}")
+                return 0
+            
+            count = 0
+            for (comp, param, row, col), response in zip(chunk, responses):
+                if 'error' in response:
+                    logger.warning(f"[{ip}] Failed to subscribe to {comp.name}.{param.name}[{row}][{col}]: {response['error']}")
+                    continue
+                
+                # Store initial value
+                if 'value' in response:
+                    param.set_value(row, col, response['value'])
+                    self._publish_update(ip, comp, param, row, col, response['value'])
+                
+                count += 1
+            return count
+        
+        # Chunks go out concurrently; device.inflight caps how many are outstanding
+        subscription_count = sum(await asyncio.gather(*[
+            subscribe_chunk(cells[start:start + BATCH_SIZE])
+            for start in range(0, len(cells), BATCH_SIZE)
+        ]))
         
         logger.info(f"[{ip}] Subscribed to {subscription_count} parameter cells")
     
@@ -393,114 +640,140 @@ class CentralHub:
         
         async for message in device.websocket:
             try:
-                data = json.loads(message)
+                data = orjson.loads(message)
                 
-                # Check if this is a response to a pending request
-                if 'id' in data and data['id'] in device.pending_requests:
-                    future = device.pending_requests[data['id']]
-                    if not future.done():
-                        future.set_result(data)
+                # Responses (single or batch) go to their waiting requests
+                if device.dispatcher.dispatch(data):
                     continue
                 
                 # Handle push updates
                 if data.get('type') == 'param_update':
                     self._handle_param_update(device, data)
                     
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"[{ip}] Invalid JSON: {e}")
             except Exception as e:
                 logger.error(f"[{ip}] Error handling message: {e}")
     
     def _handle_param_update(self, device: ESP32Device, data: dict):
         """Handle a parameter update push message."""
-        ip = device.ip
         param_id = data.get('param_id')
-        row = data.get('row', 0)
-        col = data.get('col', 0)
-        value = data.get('value')
         
         # Find the parameter
-        result = device.get_param_by_id(param_id)
+        result = device.params_by_id.get(param_id)
         if not result:
-            logger.warning(f"[{ip}] Update for unknown param_id {param_id}")
+            logger.warning(f"[{device.ip}] Update for unknown param_id {param_id}")
             return
         
-        component, param = result
-        old_value = param.get_value(row, col)
-        param.set_value(row, col, value)
-        
-        # Update remote state cache for Watcher
-        if ip not in self.remote_state_cache:
-            self.remote_state_cache[ip] = {}
-        cache_key = f"{component.name}.{param.name}[{row},{col}]"
-        self.remote_state_cache[ip][cache_key] = value
-        
-        # Also store by param_id for faster lookups
-        cache_key_id = f"param_{param_id}[{row},{col}]"
-        self.remote_state_cache[ip][cache_key_id] = value
-        
-        # Update device info with cached_state reference for Watcher
-        if ip in self.devices:
-            # Ensure devices dict has easy access to cached state
-            pass  # Already stored in remote_state_cache
-        
-        # Print the update
-        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-        logger.info(
-            f"[{timestamp}] {ip} / {component.name} / {param.name}[{row}][{col}]: "
-            f"{old_value} -> {value}"
-        )
+        result[1].apply(data.get('row', 0), data.get('col', 0), data.get('value'))
+    
+    def _make_apply(self, ip: str, component: Component,
+                    param: Parameter) -> Callable[[int, int, Any], None]:
+        """
+        Build the push-update handler for one remote parameter.
+        
+        Everything fixed at discovery time (storage, shape, names, the update
+        bus) is bound up front, so an update is a bounds check, a list store,
+        a queue put and the log line.
+        """
+        values = param.values
+        rows, cols = param.rows, param.cols
+        comp_name, param_name = component.name, param.name
+        put_event = self._put_event
+        monotonic_ns = time.monotonic_ns
+        
+        def apply(row: int, col: int, value: Any):
+            if not (0 <= row < rows and 0 <= col < cols):
+                raise IndexError(f"{param_name}[{row}][{col}] out of range ({rows}x{cols})")
+            idx = row * cols + col
+            old_value = values[idx]
+            values[idx] = value
+            param.last_updated_ns = now = monotonic_ns()
+            
+            put_event((ip, comp_name, param_name, row, col, value))
+            
+            # Print the update
+            if logger.isEnabledFor(logging.INFO):
+                timestamp = _wall_time(now).strftime('%H:%M:%S.%f')[:-3]
+                logger.info(
+                    "[%s] %s / %s / %s[%s][%s]: %s -> %s",
+                    timestamp, ip, comp_name, param_name, row, col, old_value, value
+                )
+        
+        return apply
+    
+    def _publish_update(self, ip: str, component: Component, param: Parameter,
+                        row: int, col: int, value: Any):
+        """Put a remote value change on the update bus."""
+        self._put_event((ip, component.name, param.name, row, col, value))
+    
+    def _put_event(self, event: tuple):
+        """Put an event on the update bus, dropping the oldest event if it is full."""
+        try:
+            self.update_bus.put_nowait(event)
+        except asyncio.QueueFull:
+            self.update_bus.get_nowait()
+            self.update_bus.put_nowait(event)
+    
+    def get_remote_value(self, ip: str, component_name: str, param_name: str,
+                         row: int = 0, col: int = 0) -> Any:
+        """Get a mirrored remote parameter value, or None if unknown."""
+        device = self.devices.get(ip)
+        comp = device.components.get(component_name) if device else None
+        param = comp.parameters.get(param_name) if comp else None
+        return param.get_value(row, col) if param else None
     
     def get_state_snapshot(self) -> dict:
-        """Get a complete snapshot of all device states."""
-        snapshot = {}
-        
-        for ip, device in self.devices.items():
-            device_data = {
+        """
+        Get a complete snapshot of all device states.
+        
+        Each parameter's 'values' is a dense rows x cols list of lists, read as
+        values[row][col]; cells not yet received from the device are None.
+        """
+        return {
+            ip: {
                 'connected': device.connected,
-                'components': {}
-            }
-            
-            for comp_name, comp in device.components.items():
-                comp_data = {}
-                for param_name, param in comp.parameters.items():
-                    comp_data[param_name] = {
-                        'type': param.param_type,
-                        'read_only': param.read_only,
-                        'values': {f"{r},{c}": v for (r, c), v in param.values.items()},
-                        'last_updated': param.last_updated.isoformat() if param.last_updated else None
+                'components': {
+                    comp_name: {
+                        param_name: {
+                            'type': param.param_type,
+                            'read_only': param.read_only,
+                            'values': param.to_rows(),
+                            'last_updated': param.last_updated.isoformat() if param.last_updated_ns else None
+                        }
+                        for param_name, param in comp.parameters.items()
                     }
-                device_data['components'][comp_name] = comp_data
-            
-            snapshot[ip] = device_data
-        
-        return snapshot
+                    for comp_name, comp in device.components.items()
+                }
+            }
+            for ip, device in self.devices.items()
+        }
     
     def print_state(self):
-        """Print current state of all devices."""
-        print("\n" + "=" * 80)
-        print("CENTRAL HUB STATE SNAPSHOT")
-        print("=" * 80)
+        """Print current state of all devices (built up and written in one go)."""
+        lines = ["", "=" * 80, "CENTRAL HUB STATE SNAPSHOT", "=" * 80]
         
         for ip, device in self.devices.items():
             status = "✓ Connected" if device.connected else "✗ Disconnected"
-            print(f"\n[{ip}] {status}")
-            print("-" * 40)
+            lines.append(f"\n[{ip}] {status}")
+            lines.append("-" * 40)
             
             for comp_name, comp in device.components.items():
-                print(f"  📦 {comp_name}")
+                lines.append(f"  📦 {comp_name}")
                 for param_name, param in comp.parameters.items():
                     ro = "🔒" if param.read_only else "✏️"
-                    for (row, col), value in param.values.items():
-                        print(f"    {ro} {param_name}[{row}][{col}] = {value}")
-        
-        print("\n" + "=" * 80)
+                    lines.extend(
+                        f"    {ro} {param_name}[{row}][{col}] = {value}"
+                        for (row, col), value in param.items()
+                    )
+        
+        lines.append("\n" + "=" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 async def main():
     """Main entry point."""
-    import sys
-    
     # Get device list from command line first, then env, then config
     if len(sys.argv) > 1:
         devices = sys.argv[1:]
@@ -520,13 +793,19 @@ async def main():
     
     hub = CentralHub(devices, ws_port=WS_SERVER_PORT)
     
+    # Keep log formatting and console I/O off the event loop
+    log_listener = _start_background_logging()
+    
     try:
         await hub.start()
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
     finally:
         await hub.stop()
+        log_listener.stop()
 
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -1,5 +1,5 @@
 # Central Hub Components
-from .base import Component, IntParameter, FloatParameter, BoolParameter, StringParameter, ParameterType
+from .base import Component, BaseParameter, IntParameter, FloatParameter, BoolParameter, StringParameter, ParameterType
 from .network_actions import NetworkActionsComponent
 from .action_manager import ActionManagerComponent
 from .watcher import WatcherComponent
@@ -7,6 +7,7 @@ from .web_server import WebServerComponent
 
 __all__ = [
     'Component',
+    'BaseParameter',
     'IntParameter', 
     'FloatParameter',
     'BoolParameter', 
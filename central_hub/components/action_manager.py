@@ -9,11 +9,11 @@ Manages a time-ordered queue of actions that can:
 
 import asyncio
 import heapq
-import json
 import logging
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import orjson
 
 from .base import Component, IntParameter, StringParameter, BoolParameter
 
@@ -22,13 +22,21 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('ActionManager')
 
+# Max distinct device strings memoized by _resolve_device before the cache is reset
+RESOLVE_CACHE_SIZE = 256
+
+# Max SET requests packed into a single {"type": "batch"} frame to one device
+SET_BATCH_SIZE = 32
+
+# Retry delay after an error in the processing loop, doubling up to the max (seconds)
+ERROR_BACKOFF_MIN = 0.1
+ERROR_BACKOFF_MAX = 1.0
+
+
+# Queue entry: (execute_at time.monotonic() seconds, sequence number, action).
+# The sequence number breaks ties so equal-time actions run in queue order.
+QueuedAction = Tuple[float, int, Dict[str, Any]]
 
-@dataclass(order=True)
-class QueuedAction:
-    """An action waiting to be executed at a specific time."""
-    execute_at: float  # Unix timestamp
-    action: Dict[str, Any] = field(compare=False)
-    
 
 class ActionManagerComponent(Component):
     """
@@ -91,19 +99,34 @@ class ActionManagerComponent(Component):
             default_val="{}"
         )
         
-        # Shadow dict for O(1) nickname lookups
+        # Shadow dict for O(1) nickname lookups, and the JSON it was parsed from
         self._nickname_map: Dict[str, str] = {}
+        self._nickname_map_raw: Optional[str] = None
+        
+        # Set while add_nickname edits are waiting to be written to device_nicknames
+        self._nicknames_dirty = False
         
-        # Priority queue (min-heap by execute_at time)
+        # Memoized _resolve_device results; cleared whenever nicknames change
+        self._resolve_cache: Dict[str, str] = {}
+        
+        # Priority queue (min-heap by execute_at time, then sequence number)
         self._action_queue: List[QueuedAction] = []
+        self._seq = 0
         
         # Processing task
         self._processing_task: Optional[asyncio.Task] = None
         self._running = False
         
+        # Shadow of enabled[0][0] for the processing loop, kept current by _on_enabled_change
+        self._enabled_flag: bool = self.enabled.get_value(0, 0)
+        
+        # Set whenever the queue or enabled state changes, to wake the processing loop
+        self._wake = asyncio.Event()
+        
         # Register callbacks
         self.action_to_send.on_change(self._on_action_to_send_change)
         self.device_nicknames.on_change(self._on_nicknames_change)
+        self.enabled.on_change(self._on_enabled_change)
     
     async def initialize(self):
         """Initialize the component."""
@@ -119,6 +142,7 @@ class ActionManagerComponent(Component):
     async def stop(self):
         """Stop the action processing loop."""
         self._running = False
+        self._wake.set()
         if self._processing_task:
             self._processing_task.cancel()
             try:
@@ -127,22 +151,39 @@ class ActionManagerComponent(Component):
                 pass
         logger.info("ActionManager processing stopped")
     
-    def _parse_nicknames(self):
-        """Parse the device_nicknames JSON into the shadow dict."""
+    def _parse_nicknames(self) -> bool:
+        """
+        Parse the device_nicknames JSON into the shadow dict, keyed by lowercased nickname.
+        Returns False if it hasn't changed.
+        """
+        raw = self.device_nicknames.get_value(0, 0)
+        if raw == self._nickname_map_raw:
+            return False
+        self._nickname_map_raw = raw
+        
         try:
-            raw = self.device_nicknames.get_value(0, 0)
-            if raw:
-                self._nickname_map = json.loads(raw)
-            else:
-                self._nickname_map = {}
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse device nicknames: {e}")
-            self._nickname_map = {}
+            parsed = orjson.loads(raw) if raw else {}
+            if not isinstance(parsed, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:  # Includes orjson.JSONDecodeError
+            logger.error("Failed to parse device nicknames: %s", e)
+            parsed = {}
+        
+        # Update in place - the Watcher shares this dict
+        self._nickname_map.clear()
+        self._nickname_map.update({k.lower(): v for k, v in parsed.items()})
+        self._resolve_cache.clear()
+        return True
     
     def _on_nicknames_change(self, param, row, col, new_value, old_value):
         """Update shadow dict when nicknames change."""
-        self._parse_nicknames()
-        logger.debug(f"Device nicknames updated: {self._nickname_map}")
+        if self._parse_nicknames():
+            logger.debug("Device nicknames updated: %s", self._nickname_map)
+    
+    def _on_enabled_change(self, param, row, col, new_value, old_value):
+        """Update the enabled shadow and wake the processing loop."""
+        self._enabled_flag = bool(new_value)
+        self._wake.set()
     
     def _on_action_to_send_change(self, param, row, col, new_value, old_value):
         """Process new actions when action_to_send is set."""
@@ -150,7 +191,7 @@ class ActionManagerComponent(Component):
             return
         
         try:
-            data = json.loads(new_value)
+            data = orjson.loads(new_value)
             actions = data.get('actions', [])
             
             if not actions:
@@ -159,95 +200,145 @@ class ActionManagerComponent(Component):
             
             self._queue_actions(actions)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in action_to_send: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid JSON in action_to_send: %s", e)
         finally:
             # Clear the cell after processing
             self.action_to_send.set_value(0, 0, "", notify=False)
     
     def _queue_actions(self, actions: List[Dict[str, Any]]):
         """Queue a list of actions with their delays."""
-        current_time = time.time()
+        current_time = time.monotonic()
         cumulative_delay = 0.0
+        new_items: List[QueuedAction] = []
+        seq = self._seq
         
         for action in actions:
             # Calculate execution time
-            execute_at = current_time + cumulative_delay
-            
-            # Add to priority queue
-            queued = QueuedAction(execute_at=execute_at, action=action)
-            heapq.heappush(self._action_queue, queued)
+            seq += 1
+            new_items.append((current_time + cumulative_delay, seq, action))
             
             # Accumulate delay for next action
             wait_ms = action.get('wait_after_ms', 0)
             cumulative_delay += wait_ms / 1000.0
+        self._seq = seq
         
-        # Update queue length
+        # Add to priority queue: rebuilding the heap is O(n + k), which beats
+        # k pushes unless the queue already holds far more than this batch
+        queue = self._action_queue
+        if len(new_items) >= len(queue):
+            queue.extend(new_items)
+            heapq.heapify(queue)
+        else:
+            for queued in new_items:
+                heapq.heappush(queue, queued)
+        
+        # Update queue length and wake the processing loop
         self.queue_length.set_value(0, 0, len(self._action_queue))
-        logger.info(f"Queued {len(actions)} actions, queue size: {len(self._action_queue)}")
+        self._wake.set()
+        logger.info("Queued %d actions, queue size: %d", len(actions), len(self._action_queue))
     
     async def _process_queue(self):
         """Main loop for processing queued actions."""
+        error_delay = ERROR_BACKOFF_MIN
         while self._running:
             try:
-                if not self.enabled.get_value(0, 0):
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                if not self._action_queue:
-                    await asyncio.sleep(0.05)  # 50ms idle check
+                if not self._enabled_flag or not self._action_queue:
+                    # Sleep until something is queued or processing is re-enabled
+                    await self._wake.wait()
+                    self._wake.clear()
                     continue
                 
                 # Peek at next action
-                next_action = self._action_queue[0]
-                now = time.time()
+                execute_at = self._action_queue[0][0]
+                now = time.monotonic()
                 
-                if next_action.execute_at <= now:
-                    # Time to execute
-                    heapq.heappop(self._action_queue)
-                    self.queue_length.set_value(0, 0, len(self._action_queue))
-                    
-                    await self._execute_action(next_action.action)
+                if execute_at <= now:
+                    # Time to execute - take every action that is due so that
+                    # SETs to the same device can share one frame, and keep
+                    # going while more come due during the burst
+                    queue = self._action_queue
+                    while self._enabled_flag and queue and queue[0][0] <= now:
+                        due = []
+                        while queue and queue[0][0] <= now:
+                            due.append(heapq.heappop(queue))
+                        await self._execute_actions(due)
+                        now = time.monotonic()
+                    self.queue_length.set_value(0, 0, len(queue))
+                    error_delay = ERROR_BACKOFF_MIN
                 else:
-                    # Wait until next action time or 100ms, whichever is shorter
-                    wait_time = min(next_action.execute_at - now, 0.1)
-                    await asyncio.sleep(wait_time)
+                    # Wait until next action time, or earlier if the queue changes
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=execute_at - now)
+                        self._wake.clear()
+                    except asyncio.TimeoutError:
+                        pass
                     
             except asyncio.CancelledError:
                 raise
             except Exception as e:
-                logger.error(f"Error in action processing loop: {e}")
-                await asyncio.sleep(0.1)
+                logger.error("Error in action processing loop: %s", e)
+                await asyncio.sleep(error_delay)
+                error_delay = min(error_delay * 2, ERROR_BACKOFF_MAX)
     
-    async def _execute_action(self, action: Dict[str, Any]):
-        """Execute a single action."""
-        device = action.get('device', 'self')
-        value = action.get('value')
-        row = action.get('row', 0)
-        col = action.get('col', 0)
+    async def _execute_actions(self, entries: List[QueuedAction]):
+        """
+        Execute a burst of due queue entries.
         
-        # Resolve device
-        target_device = self._resolve_device(device)
+        Local actions run immediately, in order. Remote SET requests are
+        grouped by device and sent together once the burst has been walked.
+        If a local action disables processing, the rest go back on the queue.
+        """
+        remote_requests: Dict[str, List[Dict[str, Any]]] = {}
         
-        logger.debug(f"Executing action: device={target_device}, value={value}")
+        for i, (_, _, action) in enumerate(entries):
+            if not self._enabled_flag:
+                for entry in entries[i:]:
+                    heapq.heappush(self._action_queue, entry)
+                break
+            
+            try:
+                device = action.get('device', 'self')
+                value = action.get('value')
+                row = action.get('row', 0)
+                col = action.get('col', 0)
+                
+                # Resolve device
+                target_device = self._resolve_device(device)
+                
+                logger.debug("Executing action: device=%s, value=%s", target_device, value)
+                
+                if target_device == 'self':
+                    # Local parameter change
+                    await self._execute_local_action(action, row, col, value)
+                else:
+                    # Remote device
+                    request = self._build_remote_request(target_device, action, row, col, value)
+                    if request is not None:
+                        remote_requests.setdefault(target_device, []).append(request)
+            except Exception as e:
+                # Only this action is lost; the rest of the burst still runs
+                logger.error("Failed to execute action %s: %s", action, e)
         
-        if target_device == 'self':
-            # Local parameter change
-            await self._execute_local_action(action, row, col, value)
-        else:
-            # Remote device
-            await self._execute_remote_action(target_device, action, row, col, value)
+        for device_ip, requests in remote_requests.items():
+            await self._execute_remote_requests(device_ip, requests)
     
     def _resolve_device(self, device: str) -> str:
         """Resolve device identifier - could be IP, nickname, or 'self'."""
-        if device.lower() == 'self':
-            return 'self'
+        resolved = self._resolve_cache.get(device)
+        if resolved is not None:
+            return resolved
         
-        # Check nickname map
-        if device in self._nickname_map:
-            return self._nickname_map[device]
+        if device.lower() == 'self':
+            resolved = 'self'
+        else:
+            # Check nickname map (keys are lowercase)
+            resolved = self._nickname_map.get(device.lower(), device)
         
-        return device
+        if len(self._resolve_cache) >= RESOLVE_CACHE_SIZE:
+            self._resolve_cache.clear()
+        self._resolve_cache[device] = resolved
+        return resolved
     
     async def _execute_local_action(self, action: Dict[str, Any], 
                                      row: int, col: int, value: Any):
@@ -265,10 +356,7 @@ class ActionManagerComponent(Component):
         
         if param_id is not None:
             # Look up by ID across all local components
-            for comp in self.hub.local_components.values():
-                param = comp.get_param_by_id(param_id)
-                if param:
-                    break
+            param = self.hub.local_params_by_id.get(param_id)
         elif component_name and param_name:
             # Look up by component and param name
             comp = self.hub.local_components.get(component_name)
@@ -277,25 +365,25 @@ class ActionManagerComponent(Component):
         
         if param:
             if param.read_only:
-                logger.warning(f"Cannot set read-only parameter: {param.name}")
+                logger.warning("Cannot set read-only parameter: %s", param.name)
             else:
                 param.set_value(row, col, value)
-                logger.debug(f"Set local {param.name}[{row},{col}] = {value}")
+                logger.debug("Set local %s[%s,%s] = %s", param.name, row, col, value)
         else:
-            logger.warning(f"Local parameter not found: {action}")
+            logger.warning("Local parameter not found: %s", action)
     
-    async def _execute_remote_action(self, device_ip: str, action: Dict[str, Any],
-                                      row: int, col: int, value: Any):
-        """Execute action on a remote ESP32 device."""
+    def _build_remote_request(self, device_ip: str, action: Dict[str, Any],
+                              row: int, col: int, value: Any) -> Optional[Dict[str, Any]]:
+        """Build the SET request for an action on a remote ESP32 device, or None if it can't be resolved."""
         if not self.hub:
             logger.error("No hub reference, cannot execute remote action")
-            return
+            return None
         
         # Find the device connection
         device = self.hub.devices.get(device_ip)
         if not device:
-            logger.warning(f"Device not found: {device_ip}")
-            return
+            logger.warning("Device not found: %s", device_ip)
+            return None
         
         # Determine param_id
         param_id = action.get('param_id')
@@ -314,28 +402,36 @@ class ActionManagerComponent(Component):
                         param_id = param.param_id
         
         if param_id is None:
-            logger.error(f"Cannot determine param_id for remote action: {action}")
-            return
-        
-        # Send SET request via WebSocket
-        ws = device.websocket
-        if not ws:
-            logger.error(f"No WebSocket connection to {device_ip}")
-            return
+            logger.error("Cannot determine param_id for remote action: %s", action)
+            return None
         
-        request = {
+        return {
             'type': 'SET',
             'param_id': param_id,
             'row': row,
             'col': col,
             'value': value
         }
+    
+    async def _execute_remote_requests(self, device_ip: str, requests: List[Dict[str, Any]]):
+        """Send SET requests to a remote ESP32 device, batching them into as few frames as possible."""
+        device = self.hub.devices.get(device_ip)
+        ws = device.websocket if device else None
+        if not ws:
+            logger.error("No WebSocket connection to %s", device_ip)
+            return
         
-        try:
-            await ws.send(json.dumps(request))
-            logger.debug(f"Sent SET to {device_ip}: {request}")
-        except Exception as e:
-            logger.error(f"Failed to send action to {device_ip}: {e}")
+        for start in range(0, len(requests), SET_BATCH_SIZE):
+            chunk = requests[start:start + SET_BATCH_SIZE]
+            # A lone request goes out as a plain frame; more share one batch frame
+            message = chunk[0] if len(chunk) == 1 else {'type': 'batch', 'msgs': chunk}
+            
+            try:
+                await ws.send(orjson.dumps(message))
+                logger.debug("Sent %d SET request(s) to %s: %s", len(chunk), device_ip, chunk)
+            except Exception as e:
+                logger.error("Failed to send action to %s: %s", device_ip, e)
+                return
     
     # Convenience methods for programmatic use
     
@@ -363,11 +459,33 @@ class ActionManagerComponent(Component):
     
     def add_nickname(self, nickname: str, ip_address: str):
         """Add or update a device nickname."""
-        self._nickname_map[nickname] = ip_address
-        self.device_nicknames.set_value(0, 0, json.dumps(self._nickname_map))
+        self._nickname_map[nickname.lower()] = ip_address
+        self._resolve_cache.clear()
+        self._schedule_nickname_flush()
+
+    def _schedule_nickname_flush(self):
+        """Write the nickname map back to device_nicknames once, after the current callback."""
+        if self._nicknames_dirty:
+            return
+        self._nicknames_dirty = True
+        try:
+            asyncio.get_running_loop().call_soon(self._flush_nicknames)
+        except RuntimeError:
+            # No event loop yet (e.g. configured before start) - write now
+            self._flush_nicknames()
+    
+    def _flush_nicknames(self):
+        """Serialize the nickname map into device_nicknames if it has pending edits."""
+        if not self._nicknames_dirty:
+            return
+        self._nicknames_dirty = False
+        raw = orjson.dumps(self._nickname_map).decode()
+        self._nickname_map_raw = raw  # Already reflected in the map; skip re-parsing
+        self.device_nicknames.set_value(0, 0, raw)
     
     def clear_queue(self):
         """Clear all pending actions."""
         self._action_queue.clear()
         self.queue_length.set_value(0, 0, 0)
+        self._wake.set()
         logger.info("Action queue cleared")
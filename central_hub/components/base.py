@@ -4,10 +4,11 @@ Mirrors the ESP32 component/parameter system architecture.
 """
 
 import asyncio
+import itertools
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
@@ -21,7 +22,7 @@ class ParameterType(Enum):
     STRING = 'str'
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseParameter(ABC):
     """Base class for all parameters."""
     name: str
@@ -29,34 +30,52 @@ class BaseParameter(ABC):
     rows: int
     cols: int
     read_only: bool = False
-    _values: Dict[Tuple[int, int], Any] = field(default_factory=dict, repr=False)
+    _values: List[Any] = field(default_factory=list, repr=False)  # row-major, index row * cols + col
     _on_change_callbacks: List[Callable] = field(default_factory=list, repr=False)
-    last_updated: Optional[datetime] = None
+    _callbacks: Tuple[Callable, ...] = field(default=(), repr=False)  # Snapshot of _on_change_callbacks for set_value
+    last_updated: Optional[float] = None  # time.time() of the last change
     
     @property
     @abstractmethod
     def param_type(self) -> ParameterType:
         pass
     
+    def _index(self, row: int, col: int) -> Optional[int]:
+        """Flat index of a cell, or None if out of range."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return None
+    
     def get_value(self, row: int = 0, col: int = 0) -> Any:
-        return self._values.get((row, col))
+        idx = self._index(row, col)
+        return None if idx is None else self._values[idx]
     
     def set_value(self, row: int, col: int, value: Any, notify: bool = True):
         """Set value and optionally trigger callbacks."""
-        old_value = self._values.get((row, col))
-        self._values[(row, col)] = value
-        self.last_updated = datetime.now()
-        
-        if notify and old_value != value:
-            for callback in self._on_change_callbacks:
-                try:
-                    callback(self, row, col, value, old_value)
-                except Exception as e:
-                    logger.error(f"Error in onChange callback for {self.name}: {e}")
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        values = self._values
+        old_value = values[idx]
+        if old_value == value:
+            return
+        values[idx] = value
+        self.last_updated = time.time()
+        if notify and self._callbacks:
+            self._notify(row, col, value, old_value)
+    
+    def _notify(self, row: int, col: int, value: Any, old_value: Any):
+        """Run the onChange callbacks for a changed cell."""
+        for callback in self._callbacks:
+            try:
+                callback(self, row, col, value, old_value)
+            except Exception as e:
+                logger.error(f"Error in onChange callback for {self.name}: {e}")
     
     def on_change(self, callback: Callable):
         """Register a callback for value changes."""
         self._on_change_callbacks.append(callback)
+        self._callbacks = tuple(self._on_change_callbacks)
     
     def to_dict(self) -> dict:
         """Serialize parameter metadata."""
@@ -70,7 +89,7 @@ class BaseParameter(ABC):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class IntParameter(BaseParameter):
     min_val: int = 0
     max_val: int = 100
@@ -82,25 +101,35 @@ class IntParameter(BaseParameter):
     
     def __post_init__(self):
         # Initialize all cells with default value
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) not in self._values:
-                    self._values[(r, c)] = self.default_val
+        if not self._values:
+            self._values = [self.default_val] * (self.rows * self.cols)
     
     def set_value(self, row: int, col: int, value: Any, notify: bool = True):
-        # Clamp to min/max
+        # Clamp to min/max (comparisons, not min()/max() calls)
         value = int(value)
-        value = max(self.min_val, min(self.max_val, value))
-        super().set_value(row, col, value, notify)
+        lo, hi = self.min_val, self.max_val
+        value = value if value > lo else lo
+        value = value if value < hi else hi
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        values = self._values
+        old_value = values[idx]
+        if old_value == value:
+            return
+        values[idx] = value
+        self.last_updated = time.time()
+        if notify and self._callbacks:
+            self._notify(row, col, value, old_value)
     
     def to_dict(self) -> dict:
-        d = super().to_dict()
+        d = BaseParameter.to_dict(self)  # No zero-arg super(): slots=True rebuilds the class
         d['min'] = self.min_val
         d['max'] = self.max_val
         return d
 
 
-@dataclass
+@dataclass(slots=True)
 class FloatParameter(BaseParameter):
     min_val: float = 0.0
     max_val: float = 100.0
@@ -111,24 +140,34 @@ class FloatParameter(BaseParameter):
         return ParameterType.FLOAT
     
     def __post_init__(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) not in self._values:
-                    self._values[(r, c)] = self.default_val
+        if not self._values:
+            self._values = [self.default_val] * (self.rows * self.cols)
     
     def set_value(self, row: int, col: int, value: Any, notify: bool = True):
         value = float(value)
-        value = max(self.min_val, min(self.max_val, value))
-        super().set_value(row, col, value, notify)
+        lo, hi = self.min_val, self.max_val
+        value = value if value > lo else lo
+        value = value if value < hi else hi
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        values = self._values
+        old_value = values[idx]
+        if old_value == value:
+            return
+        values[idx] = value
+        self.last_updated = time.time()
+        if notify and self._callbacks:
+            self._notify(row, col, value, old_value)
     
     def to_dict(self) -> dict:
-        d = super().to_dict()
+        d = BaseParameter.to_dict(self)  # No zero-arg super(): slots=True rebuilds the class
         d['min'] = self.min_val
         d['max'] = self.max_val
         return d
 
 
-@dataclass
+@dataclass(slots=True)
 class BoolParameter(BaseParameter):
     default_val: bool = False
     
@@ -137,20 +176,28 @@ class BoolParameter(BaseParameter):
         return ParameterType.BOOL
     
     def __post_init__(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) not in self._values:
-                    self._values[(r, c)] = self.default_val
+        if not self._values:
+            self._values = [self.default_val] * (self.rows * self.cols)
     
     def set_value(self, row: int, col: int, value: Any, notify: bool = True):
         if isinstance(value, str):
             value = value.lower() in ('true', '1', 'yes')
         else:
             value = bool(value)
-        super().set_value(row, col, value, notify)
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        values = self._values
+        old_value = values[idx]
+        if old_value == value:
+            return
+        values[idx] = value
+        self.last_updated = time.time()
+        if notify and self._callbacks:
+            self._notify(row, col, value, old_value)
 
 
-@dataclass
+@dataclass(slots=True)
 class StringParameter(BaseParameter):
     default_val: str = ""
     
@@ -159,20 +206,28 @@ class StringParameter(BaseParameter):
         return ParameterType.STRING
     
     def __post_init__(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r, c) not in self._values:
-                    self._values[(r, c)] = self.default_val
+        if not self._values:
+            self._values = [self.default_val] * (self.rows * self.cols)
     
     def set_value(self, row: int, col: int, value: Any, notify: bool = True):
         value = str(value) if value is not None else ""
-        super().set_value(row, col, value, notify)
+        idx = self._index(row, col)
+        if idx is None:
+            raise IndexError(f"{self.name}[{row}][{col}] out of range ({self.rows}x{self.cols})")
+        values = self._values
+        old_value = values[idx]
+        if old_value == value:
+            return
+        values[idx] = value
+        self.last_updated = time.time()
+        if notify and self._callbacks:
+            self._notify(row, col, value, old_value)
 
 
 class Component(ABC):
     """Base class for all components in the Central Hub."""
     
-    _next_param_id = 1  # Class-level ID counter
+    _param_id_counter = itertools.count(1)  # Class-level ID counter
     
     def __init__(self, name: str):
         self.name = name
@@ -182,9 +237,14 @@ class Component(ABC):
         self.hub = None  # Reference to CentralHub, set during registration
     
     def _get_next_param_id(self) -> int:
-        pid = Component._next_param_id
-        Component._next_param_id += 1
-        return pid
+        return next(Component._param_id_counter)
+    
+    def _register_param(self, param: BaseParameter):
+        """Index a new parameter by name and ID (and in the hub's index, if registered)."""
+        self.parameters[param.name] = param
+        self.params_by_id[param.param_id] = param
+        if self.hub is not None:
+            self.hub.local_params_by_id[param.param_id] = param
     
     def add_int_param(self, name: str, rows: int = 1, cols: int = 1,
                       min_val: int = 0, max_val: int = 100, 
@@ -199,8 +259,7 @@ class Component(ABC):
             default_val=default_val,
             read_only=read_only,
         )
-        self.parameters[name] = param
-        self.params_by_id[param.param_id] = param
+        self._register_param(param)
         return param
     
     def add_float_param(self, name: str, rows: int = 1, cols: int = 1,
@@ -216,8 +275,7 @@ class Component(ABC):
             default_val=default_val,
             read_only=read_only,
         )
-        self.parameters[name] = param
-        self.params_by_id[param.param_id] = param
+        self._register_param(param)
         return param
     
     def add_bool_param(self, name: str, rows: int = 1, cols: int = 1,
@@ -230,8 +288,7 @@ class Component(ABC):
             default_val=default_val,
             read_only=read_only,
         )
-        self.parameters[name] = param
-        self.params_by_id[param.param_id] = param
+        self._register_param(param)
         return param
     
     def add_string_param(self, name: str, rows: int = 1, cols: int = 1,
@@ -244,8 +301,7 @@ class Component(ABC):
             default_val=default_val,
             read_only=read_only,
         )
-        self.parameters[name] = param
-        self.params_by_id[param.param_id] = param
+        self._register_param(param)
         return param
     
     def get_param(self, name: str) -> Optional[BaseParameter]:
@@ -8,13 +8,14 @@ Each message can be configured to fire-and-forget or await response.
 """
 
 import asyncio
-import json
 import logging
-import socket
 import ssl
-from typing import Any, Dict, Optional
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import aiohttp
+import orjson
 import websockets
 
 from .base import Component, IntParameter, StringParameter
@@ -24,6 +25,49 @@ logger = logging.getLogger('NetworkActions')
 # Number of network action slots
 NUM_NETWORK_ACTIONS = 100
 
+# Shared HTTP connection pool settings
+HTTP_POOL_LIMIT = 100  # max open connections across all hosts
+HTTP_DNS_CACHE_TTL = 300  # seconds
+
+# Pooled UDP endpoints unused for this long are closed (seconds)
+UDP_IDLE_TIMEOUT = 60.0
+
+# Keepalive pings on pooled WS/WSS connections (seconds)
+WS_PING_INTERVAL = 20
+WS_PING_TIMEOUT = 20
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    """Pooled UDP endpoint; hands each reply to the oldest sender waiting for one."""
+    
+    def __init__(self):
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.closed = False
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data: bytes, addr):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(data)
+                return
+    
+    def error_received(self, exc: Exception):
+        self._fail_waiters(exc)
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
+        self._fail_waiters(exc or ConnectionError("UDP endpoint closed"))
+    
+    def _fail_waiters(self, exc: Exception):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
 
 class NetworkActionsComponent(Component):
     """
@@ -43,7 +87,7 @@ class NetworkActionsComponent(Component):
         "path": "/api",  # for HTTP/WS
         "method": "POST",  # for HTTP: GET, POST, PUT, DELETE
         "headers": {},  # for HTTP
-        "body": "{}",  # message body
+        "body": "{}",  # message body (for TCP, may be a list of parts sent as one write)
         "await_response": true,  # whether to wait for response
         "timeout_ms": 5000
     }
@@ -83,35 +127,110 @@ class NetworkActionsComponent(Component):
             default_val="{}"
         )
         
-        # Shadow dict for O(1) nickname lookups
+        # Shadow dict for O(1) nickname lookups, and the JSON it was parsed from
         self._nickname_map: Dict[str, str] = {}
+        self._nickname_map_raw: Optional[str] = None
+        
+        # Set while add/remove_nickname edits are waiting to be written to device_nicknames
+        self._nicknames_dirty = False
+        
+        # Parsed message config per slot (None = empty or invalid), kept current by _on_message_change
+        self._parsed_configs: List[Optional[dict]] = [None] * NUM_NETWORK_ACTIONS
+        
+        # HTTP session shared by all HTTP/HTTPS actions (keeps connections alive)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # UDP endpoints by destination: (host, port) -> (protocol, last used monotonic time)
+        self._udp_endpoints: Dict[Tuple[str, int], Tuple[_UDPProtocol, float]] = {}
+        self._udp_last_sweep = 0.0
+        
+        # Open WS/WSS connections by URI, each with a lock serializing sends on it and the
+        # task reading its frames (see _read_ws)
+        self._ws_pool: Dict[str, Tuple[Any, asyncio.Lock, Optional[asyncio.Task]]] = {}
+        # URI -> future for the reply a send is waiting on; other frames are discarded
+        self._ws_replies: Dict[str, asyncio.Future] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
         
         # Register callbacks
         self.trigger.on_change(self._on_trigger_change)
         self.device_nicknames.on_change(self._on_nicknames_change)
+        self.network_messages.on_change(self._on_message_change)
     
     async def initialize(self):
         """Initialize the component."""
         # Load initial nickname map
         self._parse_nicknames()
+        for index in range(NUM_NETWORK_ACTIONS):
+            self._parsed_configs[index] = self._parse_config(index)
+        self._get_http_session()
         logger.info("NetworkActions component initialized")
     
-    def _parse_nicknames(self):
-        """Parse the device_nicknames JSON into the shadow dict."""
+    async def stop(self):
+        """Close pooled connections."""
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+        for protocol, _ in self._udp_endpoints.values():
+            protocol.transport.close()
+        self._udp_endpoints.clear()
+        for ws, _, reader in self._ws_pool.values():
+            if ws is not None:
+                await ws.close()
+            if reader is not None:
+                reader.cancel()
+        self._ws_pool.clear()
+        logger.info("NetworkActions stopped")
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT, ttl_dns_cache=HTTP_DNS_CACHE_TTL)
+            )
+        return self._http_session
+    
+    def _parse_nicknames(self) -> bool:
+        """
+        Parse the device_nicknames JSON into the shadow dict, keyed by lowercased nickname.
+        Returns False if it hasn't changed.
+        """
+        raw = self.device_nicknames.get_value(0, 0)
+        if raw == self._nickname_map_raw:
+            return False
+        self._nickname_map_raw = raw
         try:
-            raw = self.device_nicknames.get_value(0, 0)
             if raw:
-                self._nickname_map = json.loads(raw)
+                self._nickname_map = {k.lower(): v for k, v in orjson.loads(raw).items()}
             else:
                 self._nickname_map = {}
-        except json.JSONDecodeError as e:
+        except (orjson.JSONDecodeError, AttributeError) as e:
             logger.error(f"Failed to parse device nicknames: {e}")
             self._nickname_map = {}
+        return True
     
     def _on_nicknames_change(self, param, row, col, new_value, old_value):
         """Update shadow dict when nicknames change."""
-        self._parse_nicknames()
-        logger.debug(f"Device nicknames updated: {self._nickname_map}")
+        if self._parse_nicknames():
+            logger.debug(f"Device nicknames updated: {self._nickname_map}")
+    
+    def _parse_config(self, index: int) -> Optional[dict]:
+        """Parse the message config JSON in a slot. Returns None if it is empty or invalid."""
+        config_str = self.network_messages.get_value(index, 0)
+        if not config_str:
+            return None
+        try:
+            config = orjson.loads(config_str)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid config JSON for action {index}: {e}")
+            return None
+        if not isinstance(config, dict):
+            logger.error(f"Invalid config JSON for action {index}: expected a JSON object")
+            return None
+        return config
+    
+    def _on_message_change(self, param, row, col, new_value, old_value):
+        """Re-parse a message slot that was rewritten."""
+        self._parsed_configs[row] = self._parse_config(row)
     
     def _on_trigger_change(self, param, row, col, new_value, old_value):
         """Handle trigger changes - fire off network action."""
@@ -122,23 +241,14 @@ class NetworkActionsComponent(Component):
             self.trigger.set_value(0, 0, -1, notify=False)
     
     def resolve_host(self, host: str) -> str:
-        """Resolve a host - could be IP, hostname, or nickname."""
-        # Check nickname map first
-        if host in self._nickname_map:
-            return self._nickname_map[host]
-        return host
+        """Resolve a host - could be IP, hostname, or nickname (case-insensitive)."""
+        return self._nickname_map.get(host.lower(), host)
     
     async def _execute_action(self, index: int):
         """Execute the network action at the given index."""
-        config_str = self.network_messages.get_value(index, 0)
-        if not config_str:
-            logger.warning(f"No config for network action {index}")
-            return
-        
-        try:
-            config = json.loads(config_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid config JSON for action {index}: {e}")
+        config = self._parsed_configs[index] if 0 <= index < NUM_NETWORK_ACTIONS else None
+        if config is None:
+            logger.warning(f"No valid config for network action {index}")
             return
         
         protocol = config.get('protocol', 'HTTP').upper()
@@ -180,34 +290,62 @@ class NetworkActionsComponent(Component):
                         timeout: float, await_response: bool) -> Optional[str]:
         """Send UDP message."""
         body = config.get('body', '')
-        if isinstance(body, dict):
-            body = json.dumps(body)
+        payload = orjson.dumps(body) if isinstance(body, dict) else body.encode()
         
-        loop = asyncio.get_event_loop()
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setblocking(False)
+        protocol = await self._get_udp_endpoint(host, port)
         
-        try:
-            await loop.sock_sendto(sock, body.encode(), (host, port))
-            
-            if await_response:
-                sock.settimeout(timeout)
-                data, addr = await asyncio.wait_for(
-                    loop.sock_recvfrom(sock, 4096),
-                    timeout=timeout
-                )
-                return data.decode()
-        finally:
-            sock.close()
+        # Register for the reply before sending so it can't be missed
+        waiter = None
+        if await_response:
+            waiter = asyncio.get_running_loop().create_future()
+            protocol.waiters.append(waiter)
         
-        return None
+        protocol.transport.sendto(payload)
+        
+        if waiter is None:
+            return None
+        data = await asyncio.wait_for(waiter, timeout=timeout)
+        return data.decode()
+    
+    async def _get_udp_endpoint(self, host: str, port: int) -> _UDPProtocol:
+        """Return the pooled UDP endpoint for a destination, opening it if needed."""
+        now = time.monotonic()
+        if now - self._udp_last_sweep >= UDP_IDLE_TIMEOUT:
+            self._close_idle_udp_endpoints(now)
+        
+        key = (host, port)
+        entry = self._udp_endpoints.get(key)
+        if entry is None or entry[0].closed:
+            _, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+                _UDPProtocol, remote_addr=key
+            )
+            # Another send may have opened one for this destination meanwhile
+            entry = self._udp_endpoints.get(key)
+            if entry is not None and not entry[0].closed:
+                protocol.transport.close()
+                protocol = entry[0]
+        else:
+            protocol = entry[0]
+        
+        self._udp_endpoints[key] = (protocol, now)
+        return protocol
+    
+    def _close_idle_udp_endpoints(self, now: float):
+        """Close pooled UDP endpoints that haven't been used recently."""
+        self._udp_last_sweep = now
+        for key, (protocol, last_used) in list(self._udp_endpoints.items()):
+            if protocol.closed or (now - last_used >= UDP_IDLE_TIMEOUT and not protocol.waiters):
+                protocol.transport.close()
+                del self._udp_endpoints[key]
     
     async def _send_tcp(self, host: str, port: int, config: dict,
                         timeout: float, await_response: bool) -> Optional[str]:
         """Send TCP message."""
         body = config.get('body', '')
-        if isinstance(body, dict):
-            body = json.dumps(body)
+        # Keep multi-part bodies as separate buffers: writelines() hands them to the
+        # transport together (a single sendmsg() on Python 3.12+) without joining them
+        parts = body if isinstance(body, list) else (body,)
+        payload = [orjson.dumps(part) if isinstance(part, dict) else part.encode() for part in parts]
         
         reader, writer = await asyncio.wait_for(
             asyncio.open_connection(host, port),
@@ -215,7 +353,7 @@ class NetworkActionsComponent(Component):
         )
         
         try:
-            writer.write(body.encode())
+            writer.writelines(payload)
             await writer.drain()
             
             if await_response:
@@ -235,11 +373,11 @@ class NetworkActionsComponent(Component):
         """Send HTTP/HTTPS request."""
         method = config.get('method', 'GET').upper()
         path = config.get('path', '/')
-        headers = config.get('headers', {})
+        headers = dict(config.get('headers', {}))  # Copy: config may be cached
         body = config.get('body', '')
         
         if isinstance(body, dict):
-            body = json.dumps(body)
+            body = orjson.dumps(body)
             if 'Content-Type' not in headers:
                 headers['Content-Type'] = 'application/json'
         
@@ -248,9 +386,9 @@ class NetworkActionsComponent(Component):
         
         timeout_obj = aiohttp.ClientTimeout(total=timeout)
         
-        async with aiohttp.ClientSession(timeout=timeout_obj) as session:
-            async with session.request(method, url, headers=headers, data=body) as resp:
-                return await resp.text()
+        session = self._get_http_session()
+        async with session.request(method, url, headers=headers, data=body, timeout=timeout_obj) as resp:
+            return await resp.text()
     
     async def _send_websocket(self, protocol: str, host: str, port: int,
                               config: dict, timeout: float, 
@@ -260,24 +398,83 @@ class NetworkActionsComponent(Component):
         body = config.get('body', '')
         
         if isinstance(body, dict):
-            body = json.dumps(body)
+            body = orjson.dumps(body).decode()  # Text frame, as for string bodies
         
         scheme = 'wss' if protocol == 'WSS' else 'ws'
         uri = f"{scheme}://{host}:{port}{path}"
         
-        ssl_context = ssl.create_default_context() if protocol == 'WSS' else None
-        
-        async with websockets.connect(uri, ssl=ssl_context, close_timeout=timeout) as ws:
-            await ws.send(body)
+        _, lock, _ = self._ws_pool.setdefault(uri, (None, asyncio.Lock(), None))
+        async with lock:
+            # Waiting before sending, so a fast reply isn't discarded by the reader
+            reply = asyncio.get_running_loop().create_future() if await_response else None
             
-            if await_response:
-                response = await asyncio.wait_for(
-                    ws.recv(),
-                    timeout=timeout
-                )
-                return response
+            # One reconnect if the pooled connection turns out to be dead. Only a failed
+            # send is retried: once it went out, resending could repeat the action
+            for attempt in range(2):
+                ws = self._ws_pool[uri][0]
+                if ws is None or ws.close_code is not None:
+                    ssl_context = self._get_ssl_context() if protocol == 'WSS' else None
+                    ws = await websockets.connect(
+                        uri, ssl=ssl_context,
+                        ping_interval=WS_PING_INTERVAL, ping_timeout=WS_PING_TIMEOUT,
+                    )
+                    self._ws_pool[uri] = (ws, lock, asyncio.create_task(self._read_ws(uri, ws)))
+                
+                if reply is not None:
+                    self._ws_replies[uri] = reply
+                try:
+                    await ws.send(body)
+                    break
+                except websockets.exceptions.ConnectionClosed:
+                    self._ws_pool[uri] = (None, lock, None)
+                    if attempt:
+                        raise
+            
+            if reply is None:
+                return None
+            try:
+                return await asyncio.wait_for(reply, timeout=timeout)
+            except asyncio.TimeoutError:
+                # A late reply would be read as the next response; start fresh
+                self._ws_pool[uri] = (None, lock, None)
+                await ws.close()
+                raise
+            finally:
+                if self._ws_replies.get(uri) is reply:
+                    del self._ws_replies[uri]
+    
+    async def _read_ws(self, uri: str, ws):
+        """
+        Read every frame from a pooled WebSocket for as long as it is open.
         
-        return None
+        A frame completes the reply a send is waiting on, if any, and is otherwise
+        discarded, so replies to fire-and-forget sends never queue up unread.
+        """
+        try:
+            async for message in ws:
+                if not self._is_pooled(uri, ws):
+                    break  # Replaced; replies now belong to the new connection
+                reply = self._ws_replies.pop(uri, None)
+                if reply is not None and not reply.done():
+                    reply.set_result(message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if self._is_pooled(uri, ws):
+                reply = self._ws_replies.pop(uri, None)
+                if reply is not None and not reply.done():
+                    reply.set_exception(ConnectionError(f"WebSocket {uri} closed"))
+    
+    def _is_pooled(self, uri: str, ws) -> bool:
+        """Whether ws is still the pooled connection for uri."""
+        entry = self._ws_pool.get(uri)
+        return entry is not None and entry[0] is ws
+    
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """Return the shared default SSL context for WSS, creating it on first use."""
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
     
     # Convenience methods for programmatic triggering
     
@@ -289,15 +486,36 @@ class NetworkActionsComponent(Component):
     def set_message_config(self, index: int, config: dict):
         """Set the configuration for a message slot."""
         if 0 <= index < NUM_NETWORK_ACTIONS:
-            self.network_messages.set_value(index, 0, json.dumps(config))
+            self.network_messages.set_value(index, 0, orjson.dumps(config).decode())
     
     def add_nickname(self, nickname: str, ip_address: str):
         """Add or update a device nickname."""
-        self._nickname_map[nickname] = ip_address
-        self.device_nicknames.set_value(0, 0, json.dumps(self._nickname_map))
+        self._nickname_map[nickname.lower()] = ip_address
+        self._schedule_nickname_flush()
     
     def remove_nickname(self, nickname: str):
         """Remove a device nickname."""
+        nickname = nickname.lower()
         if nickname in self._nickname_map:
             del self._nickname_map[nickname]
-            self.device_nicknames.set_value(0, 0, json.dumps(self._nickname_map))
+            self._schedule_nickname_flush()
+
+    def _schedule_nickname_flush(self):
+        """Write the nickname map back to device_nicknames once, after the current callback."""
+        if self._nicknames_dirty:
+            return
+        self._nicknames_dirty = True
+        try:
+            asyncio.get_running_loop().call_soon(self._flush_nicknames)
+        except RuntimeError:
+            # No event loop yet (e.g. configured before start) - write now
+            self._flush_nicknames()
+    
+    def _flush_nicknames(self):
+        """Serialize the nickname map into device_nicknames if it has pending edits."""
+        if not self._nicknames_dirty:
+            return
+        self._nicknames_dirty = False
+        raw = orjson.dumps(self._nickname_map).decode()
+        self._nickname_map_raw = raw  # Already reflected in the map; skip re-parsing
+        self.device_nicknames.set_value(0, 0, raw)
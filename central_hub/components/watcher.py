@@ -3,13 +3,20 @@ Watcher Component - Monitors variables and triggers actions on expression change
 
 Evaluates logic expressions every 100ms and triggers rising/falling edge actions
 when expression results change from False->True or True->False.
+
+Remote variable values are pushed in from the hub's update bus; local
+variables are read on each evaluation tick.
 """
 
+import ast
 import asyncio
-import json
+import keyword
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+from types import CodeType
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import orjson
 
 from .base import Component, StringParameter, IntParameter, BoolParameter
 
@@ -24,6 +31,36 @@ NUM_WATCH_SLOTS = 50
 # Evaluation interval in seconds
 EVAL_INTERVAL_SEC = 0.1  # 100ms
 
+# Push the evaluation counter to the eval_count parameter every N evaluations
+EVAL_COUNT_SYNC_TICKS = 10
+
+# AST node types permitted in watch expressions
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare,
+    ast.Name, ast.Load, ast.Constant,
+    ast.And, ast.Or, ast.Not, ast.UAdd, ast.USub,
+    ast.Eq, ast.NotEq, ast.Lt, ast.Gt, ast.LtE, ast.GtE,
+    ast.Add, ast.Sub, ast.Mult, ast.Div,
+)
+
+# Literal types permitted in watch expressions (no strings/bytes: 'a' * 10**9 would be legal)
+_ALLOWED_CONSTANTS = (int, float, bool)
+
+# Keywords accepted in any case, rewritten to their Python spelling
+_KEYWORDS = {'true': 'True', 'false': 'False', 'and': 'and', 'or': 'or', 'not': 'not'}
+_KEYWORD_RE = re.compile(r'\b(true|false|and|or|not)\b', re.IGNORECASE)
+
+# Globals for evaluating compiled expressions: no builtins
+_EVAL_GLOBALS = {'__builtins__': {}}
+
+# Marks a variable with no cached value
+_MISSING = object()
+
+
+def _is_variable_name(name: str) -> bool:
+    """Whether name can be used as a variable in a watch expression."""
+    return name.isidentifier() and not keyword.iskeyword(name) and name.lower() not in _KEYWORDS
+
 
 class WatcherComponent(Component):
     """
@@ -35,7 +72,8 @@ class WatcherComponent(Component):
         - rising_actions (StringParameter[NUM_WATCH_SLOTS x 1]): Actions on True transition
         - falling_actions (StringParameter[NUM_WATCH_SLOTS x 1]): Actions on False transition  
         - enabled (BoolParameter[1x1]): Whether evaluation is enabled
-        - eval_count (IntParameter[1x1]): Number of evaluations performed (read-only)
+        - eval_count (IntParameter[1x1]): Number of evaluations performed (read-only,
+          synced every EVAL_COUNT_SYNC_TICKS evaluations)
     
     Variables format (JSON object):
     {
@@ -118,46 +156,95 @@ class WatcherComponent(Component):
         # Parsed variable definitions
         self._var_defs: Dict[str, Dict[str, Any]] = {}
         
-        # Current variable values cache
+        # Current variable values cache, and a counter bumped whenever any value changes
         self._var_values: Dict[str, Any] = {}
+        self._vars_version = 0
         
-        # Previous expression results for edge detection
-        self._prev_results: Dict[int, bool] = {}
+        # Remote variables by watched cell: (component, param, row, col) -> [(device, var_name)]
+        self._remote_index: Dict[Tuple[str, str, int, int], List[Tuple[str, str]]] = {}
         
-        # Background task
+        # Device IP each remote variable's cached value came from
+        self._var_sources: Dict[str, str] = {}
+        
+        # Previous expression results for edge detection, as bitmasks (bit n = slot n):
+        # _prev_mask holds last results, _known_mask marks slots that have one
+        self._prev_mask = 0
+        self._known_mask = 0
+        
+        # Per-slot compiled expression (None = empty or invalid) and the variable names
+        # it references; validated and compiled once, when the expression is written
+        self._slot_code: List[Optional[CodeType]] = [None] * NUM_WATCH_SLOTS
+        self._slot_names: List[FrozenSet[str]] = [frozenset()] * NUM_WATCH_SLOTS
+        
+        # Variables referenced by at least one expression, in definition order, pre-resolved
+        # as (name, remote device or None, local value getter or None, (component, param, row, col))
+        # (None = recompute on the next refresh)
+        self._needed_vars: Optional[List[Tuple[str, Optional[str], Optional[Callable[[], Any]],
+                                               Tuple[str, str, int, int]]]] = None
+        
+        # Last result per slot and the _vars_version it was computed at
+        self._slot_results: Dict[int, Tuple[int, bool]] = {}
+        
+        # Set when an expression changes, so the next tick re-evaluates even if
+        # no variable did
+        self._slots_dirty = True
+        
+        # Parsed edge actions by slot: slot -> (raw JSON, actions list)
+        self._rising_cache: Dict[int, Tuple[str, List[Dict[str, Any]]]] = {}
+        self._falling_cache: Dict[int, Tuple[str, List[Dict[str, Any]]]] = {}
+        
+        # Background tasks
         self._eval_task: Optional[asyncio.Task] = None
+        self._update_task: Optional[asyncio.Task] = None
         self._running = False
         
+        # Evaluations performed; eval_count is synced from this periodically
+        self._eval_count_local = 0
+        
         # Device nickname map (shared reference from ActionManager if available)
         self._nickname_map: Dict[str, str] = {}
         
         # Register callbacks
         self.variables.on_change(self._on_variables_change)
+        self.expressions.on_change(self._on_expression_change)
+        self.rising_actions.on_change(self._on_rising_actions_change)
+        self.falling_actions.on_change(self._on_falling_actions_change)
     
     async def initialize(self):
         """Initialize the component."""
         self._parse_variables()
+        for slot in range(NUM_WATCH_SLOTS):
+            self._compile_slot(slot)
         logger.info("Watcher component initialized")
     
     async def start(self):
         """Start the evaluation loop."""
         self._running = True
         self._eval_task = asyncio.create_task(self._evaluation_loop())
+        if self.hub:
+            self._update_task = asyncio.create_task(self._consume_updates())
         logger.info("Watcher evaluation started")
     
     async def stop(self):
         """Stop the evaluation loop."""
         self._running = False
-        if self._eval_task:
-            self._eval_task.cancel()
-            try:
-                await self._eval_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._eval_task, self._update_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._sync_eval_count()
         logger.info("Watcher evaluation stopped")
     
     def set_nickname_map(self, nickname_map: Dict[str, str]):
-        """Set the device nickname map (usually shared from ActionManager)."""
+        """
+        Set the device nickname map (usually shared from ActionManager).
+        
+        Keys must already be lowercase. The dict is kept by reference, not copied,
+        so updates from the owner are seen here.
+        """
         self._nickname_map = nickname_map
     
     def _parse_variables(self):
@@ -165,173 +252,303 @@ class WatcherComponent(Component):
         try:
             raw = self.variables.get_value(0, 0)
             if raw:
-                self._var_defs = json.loads(raw)
+                self._var_defs = orjson.loads(raw)
             else:
                 self._var_defs = {}
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse variables: {e}")
             self._var_defs = {}
+        
+        # Expressions refer to variables as Python names, so any other name could never match
+        for var_name in [name for name in self._var_defs if not _is_variable_name(name)]:
+            logger.warning("Variable %r ignored: names must be identifiers (letters, digits, _) "
+                           "and not a keyword", var_name)
+            del self._var_defs[var_name]
+        
+        self._build_remote_index()
+    
+    def _build_remote_index(self):
+        """Index remote variables by the cell they watch, for update bus dispatch."""
+        index: Dict[Tuple[str, str, int, int], List[Tuple[str, str]]] = {}
+        for var_name, var_def in self._var_defs.items():
+            device = var_def.get('device', 'self')
+            if device.lower() == 'self':
+                continue
+            key = (var_def.get('component'), var_def.get('param'),
+                   var_def.get('row', 0), var_def.get('col', 0))
+            index.setdefault(key, []).append((device, var_name))
+        self._remote_index = index
     
     def _on_variables_change(self, param, row, col, new_value, old_value):
         """Update variable definitions when changed."""
         self._parse_variables()
+        # Definitions may now point elsewhere; values are re-read on the next tick
+        self._var_values.clear()
+        self._var_sources.clear()
+        self._vars_version += 1
+        self._needed_vars = None
         logger.debug(f"Variables updated: {list(self._var_defs.keys())}")
     
+    def _on_expression_change(self, param, row, col, new_value, old_value):
+        """Recompile a replaced expression and drop its last result."""
+        self._compile_slot(row)
+        self._slot_results.pop(row, None)
+        self._slots_dirty = True
+        self._needed_vars = None
+    
+    def _compile_slot(self, slot: int):
+        """Validate and compile the expression in a slot, logging if it is invalid."""
+        expr = self.expressions.get_value(slot, 0)
+        code, names = None, frozenset()
+        if expr:
+            try:
+                code, names = self._compile_expression(expr)
+            except ValueError as e:
+                logger.warning(f"Watch slot {slot} disabled: {e}")
+        self._slot_code[slot] = code
+        self._slot_names[slot] = names
+    
+    def _on_rising_actions_change(self, param, row, col, new_value, old_value):
+        """Drop the cached parse of a rewritten rising-edge slot."""
+        self._rising_cache.pop(row, None)
+    
+    def _on_falling_actions_change(self, param, row, col, new_value, old_value):
+        """Drop the cached parse of a rewritten falling-edge slot."""
+        self._falling_cache.pop(row, None)
+    
     def _resolve_device(self, device: str) -> str:
-        """Resolve device identifier."""
-        if device.lower() == 'self':
+        """Resolve device identifier (nickname keys are lowercase)."""
+        key = device.lower()
+        if key == 'self':
             return 'self'
-        if device in self._nickname_map:
-            return self._nickname_map[device]
-        return device
+        return self._nickname_map.get(key, device)
     
     async def _evaluation_loop(self):
         """Main loop for evaluating expressions."""
+        # Hot lookups bound once; none of these objects are reassigned
+        enabled_get = self.enabled.get_value
+        slot_code = self._slot_code
+        var_values = self._var_values
+        slot_results = self._slot_results
+        slot_results_get = slot_results.get
+        refresh = self._refresh_variables
+        trigger = self._trigger_actions
+        debug = logger.debug
+        sleep = asyncio.sleep
+        slots = range(NUM_WATCH_SLOTS)
+        
+        # Ticks are scheduled on fixed deadlines so time spent evaluating doesn't
+        # stretch the interval
+        clock = asyncio.get_running_loop().time
+        next_tick = clock()
+        last_version = None
+        
+        async def wait_next_tick():
+            nonlocal next_tick
+            next_tick += EVAL_INTERVAL_SEC
+            now = clock()
+            if now - next_tick > EVAL_INTERVAL_SEC:
+                next_tick = now  # Fell more than a tick behind: resync rather than catch up
+            await sleep(max(0.0, next_tick - now))
+        
         while self._running:
             try:
-                if not self.enabled.get_value(0, 0):
-                    await asyncio.sleep(EVAL_INTERVAL_SEC)
+                if not enabled_get(0, 0):
+                    self._sync_eval_count()
+                    await wait_next_tick()
                     continue
                 
                 # Refresh variable values
-                await self._refresh_variables()
+                await refresh()
+                
+                # Nothing changed since the last evaluation: results and edges would be the same
+                version = self._vars_version
+                if version == last_version and not self._slots_dirty:
+                    self._count_eval()
+                    await wait_next_tick()
+                    continue
+                last_version = version
+                self._slots_dirty = False
                 
-                # Evaluate all expressions
-                for slot in range(NUM_WATCH_SLOTS):
-                    expr = self.expressions.get_value(slot, 0)
-                    if not expr:
+                # Evaluate all expressions into bitmasks, reusing results
+                # computed since the last variable change
+                curr_mask = 0
+                valid_mask = 0
+                for slot in slots:
+                    code = slot_code[slot]
+                    if code is None:
                         continue
                     
                     try:
-                        result = self._evaluate_expression(expr)
-                        prev_result = self._prev_results.get(slot)
-                        
-                        # Check for edge transitions
-                        if prev_result is not None:
-                            if not prev_result and result:
-                                # Rising edge: False -> True
-                                await self._trigger_actions(slot, rising=True)
-                            elif prev_result and not result:
-                                # Falling edge: True -> False
-                                await self._trigger_actions(slot, rising=False)
-                        
-                        self._prev_results[slot] = result
-                        
+                        cached = slot_results_get(slot)
+                        if cached is not None and cached[0] == version:
+                            result = cached[1]
+                        else:
+                            # No builtins; names resolve to variable values
+                            result = bool(eval(code, _EVAL_GLOBALS, var_values))
+                            slot_results[slot] = (version, result)
+                        if result:
+                            curr_mask |= 1 << slot
+                        valid_mask |= 1 << slot
                     except Exception as e:
-                        logger.debug(f"Error evaluating expression slot {slot}: {e}")
+                        debug("Error evaluating expression slot %d: %s", slot, e)
                 
-                # Update eval count
-                count = self.eval_count.get_value(0, 0)
-                self.eval_count.set_value(0, 0, count + 1, notify=False)
+                # Edges: slots evaluated now that also had a previous result
+                prev_mask = self._prev_mask
+                compared = valid_mask & self._known_mask
+                rising_mask = compared & curr_mask & ~prev_mask   # False -> True
+                falling_mask = compared & prev_mask & ~curr_mask  # True -> False
                 
-                await asyncio.sleep(EVAL_INTERVAL_SEC)
+                self._prev_mask = (prev_mask & ~valid_mask) | curr_mask
+                self._known_mask |= valid_mask
+                
+                # Fire all edges concurrently, in slot order
+                triggers = []
+                edges = rising_mask | falling_mask
+                while edges:
+                    low = edges & -edges
+                    edges ^= low
+                    slot = low.bit_length() - 1
+                    triggers.append(trigger(slot, rising=bool(rising_mask & low)))
+                if triggers:
+                    await asyncio.gather(*triggers, return_exceptions=True)
+                
+                self._count_eval()
+                await wait_next_tick()
                 
             except asyncio.CancelledError:
                 raise
             except Exception as e:
                 logger.error(f"Error in evaluation loop: {e}")
-                await asyncio.sleep(EVAL_INTERVAL_SEC)
+                await wait_next_tick()
     
     async def _refresh_variables(self):
-        """Refresh all variable values from their sources."""
+        """Refresh the values of variables used by any expression from their sources."""
         if not self.hub:
             return
         
-        for var_name, var_def in self._var_defs.items():
+        if self._needed_vars is None:
+            self._needed_vars = self._collect_needed_vars()
+        
+        resolve = self._resolve_device
+        sources = self._var_sources
+        get_remote_value = self.hub.get_remote_value
+        set_var = self._set_var_value
+        unresolved = False
+        
+        for var_name, device, getter, ref in self._needed_vars:
             try:
-                device = self._resolve_device(var_def.get('device', 'self'))
-                component_name = var_def.get('component')
-                param_name = var_def.get('param')
-                row = var_def.get('row', 0)
-                col = var_def.get('col', 0)
-                
-                value = await self._get_param_value(device, component_name, param_name, row, col)
+                if getter is not None:
+                    value = getter()
+                elif device is None:
+                    unresolved = True  # Local parameter that doesn't exist (yet)
+                    continue
+                else:
+                    # Resolved per tick: the shared nickname map can change underneath us
+                    device = resolve(device)
+                    if sources.get(var_name) == device:
+                        continue  # Kept current by _consume_updates
+                    value = get_remote_value(device, *ref)
+                    if value is not None:
+                        sources[var_name] = device
                 
                 if value is not None:
-                    self._var_values[var_name] = value
+                    set_var(var_name, value)
                     
             except Exception as e:
                 logger.debug(f"Error refreshing variable {var_name}: {e}")
-    
-    async def _get_param_value(self, device: str, component_name: str, 
-                                param_name: str, row: int, col: int) -> Any:
-        """Get a parameter value from a device."""
-        if device == 'self':
-            # Local component
-            if self.hub and component_name in self.hub.local_components:
-                comp = self.hub.local_components[component_name]
-                param = comp.get_param(param_name)
-                if param:
-                    return param.get_value(row, col)
-        else:
-            # Remote device - check cached state
-            if self.hub and device in self.hub.remote_state_cache:
-                cached_state = self.hub.remote_state_cache[device]
-                
-                # Look for the parameter value in cached state
-                key = f"{component_name}.{param_name}[{row},{col}]"
-                if key in cached_state:
-                    return cached_state[key]
         
-        return None
+        if unresolved:
+            self._needed_vars = None  # Look the missing parameters up again next tick
+    
+    def _collect_needed_vars(self) -> List[Tuple[str, Optional[str], Optional[Callable[[], Any]],
+                                                 Tuple[str, str, int, int]]]:
+        """Pre-resolve the variables named by the current expressions."""
+        names: Set[str] = set().union(*self._slot_names)
+        needed = []
+        for var_name, var_def in self._var_defs.items():
+            if var_name not in names:
+                continue
+            device = var_def.get('device', 'self')
+            ref = (var_def.get('component'), var_def.get('param'),
+                   var_def.get('row', 0), var_def.get('col', 0))
+            if device.lower() != 'self':
+                needed.append((var_name, device, None, ref))
+                continue
+            
+            # Local parameter: bind its getter once
+            getter = None
+            comp = self.hub.local_components.get(ref[0])
+            param = comp.get_param(ref[1]) if comp else None
+            if param:
+                row, col = ref[2], ref[3]
+                getter = lambda get=param.get_value, row=row, col=col: get(row, col)
+            needed.append((var_name, None, getter, ref))
+        return needed
+    
+    async def _consume_updates(self):
+        """Apply remote parameter changes from the hub's update bus to watched variables."""
+        bus = self.hub.update_bus
+        while self._running:
+            ip, component_name, param_name, row, col, value = await bus.get()
+            for device, var_name in self._remote_index.get((component_name, param_name, row, col), ()):
+                if self._resolve_device(device) == ip:
+                    self._set_var_value(var_name, value)
+                    self._var_sources[var_name] = ip
     
-    def _evaluate_expression(self, expr: str) -> bool:
+    def _set_var_value(self, var_name: str, value: Any):
+        """Cache a variable's value, bumping the version if it changed."""
+        if self._var_values.get(var_name, _MISSING) != value:
+            self._var_values[var_name] = value
+            self._vars_version += 1
+    
+    def _compile_expression(self, expr: str) -> Tuple[CodeType, FrozenSet[str]]:
         """
-        Safely evaluate a logic expression with variable substitution.
+        Compile an expression to a code object, and collect the variable names it uses.
         
-        Only allows safe operators and variable references.
+        Only allows safe operators, constants and variable references.
         """
-        # Replace variable names with their values
-        result_expr = expr
-        
-        for var_name, value in self._var_values.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(var_name) + r'\b'
-            
-            # Format value appropriately
-            if isinstance(value, bool):
-                replacement = 'True' if value else 'False'
-            elif isinstance(value, str):
-                replacement = repr(value)
-            else:
-                replacement = str(value)
-            
-            result_expr = re.sub(pattern, replacement, result_expr)
-        
-        # Handle common keywords
-        result_expr = re.sub(r'\btrue\b', 'True', result_expr, flags=re.IGNORECASE)
-        result_expr = re.sub(r'\bfalse\b', 'False', result_expr, flags=re.IGNORECASE)
-        result_expr = re.sub(r'\band\b', ' and ', result_expr, flags=re.IGNORECASE)
-        result_expr = re.sub(r'\bor\b', ' or ', result_expr, flags=re.IGNORECASE)
-        result_expr = re.sub(r'\bnot\b', ' not ', result_expr, flags=re.IGNORECASE)
-        
-        # Validate expression contains only safe characters
-        allowed_chars = set('0123456789.+-*/()<=>&|! TrueFalsandor\t\n ')
-        if not all(c in allowed_chars or c.isalpha() for c in result_expr):
-            raise ValueError(f"Expression contains disallowed characters: {result_expr}")
+        # Handle common keywords in any case
+        normalized = _KEYWORD_RE.sub(lambda m: _KEYWORDS[m.group(1).lower()], expr)
         
-        # Evaluate using safe eval with no builtins
         try:
-            result = eval(result_expr, {"__builtins__": {}}, {})
-            return bool(result)
-        except Exception as e:
-            raise ValueError(f"Failed to evaluate '{result_expr}': {e}")
+            tree = ast.parse(normalized.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{expr}': {e.msg}")
+        
+        names = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"Expression contains disallowed syntax ({type(node).__name__}): {expr}")
+            if isinstance(node, ast.Constant) and type(node.value) not in _ALLOWED_CONSTANTS:
+                raise ValueError(f"Expression contains a {type(node.value).__name__} literal: {expr}")
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+        
+        return compile(tree, '<watch>', 'eval'), frozenset(names)
     
     async def _trigger_actions(self, slot: int, rising: bool):
         """Trigger rising or falling edge actions for a slot."""
         if rising:
             action_json = self.rising_actions.get_value(slot, 0)
+            cache = self._rising_cache
             edge_type = "rising"
         else:
             action_json = self.falling_actions.get_value(slot, 0)
+            cache = self._falling_cache
             edge_type = "falling"
         
         if not action_json:
             return
         
         try:
-            data = json.loads(action_json)
-            actions = data.get('actions', [])
+            cached = cache.get(slot)
+            if cached is not None and cached[0] == action_json:
+                actions = cached[1]
+            else:
+                data = orjson.loads(action_json)
+                actions = data.get('actions', [])
+                cache[slot] = (action_json, actions)
             
             if not actions:
                 return
@@ -347,29 +564,44 @@ class WatcherComponent(Component):
                     # Execute directly if no ActionManager
                     await self._execute_actions_directly(actions)
                     
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid action JSON for slot {slot}: {e}")
         except Exception as e:
             logger.error(f"Error triggering actions for slot {slot}: {e}")
     
     async def _execute_actions_directly(self, actions: List[Dict[str, Any]]):
-        """Execute actions directly without ActionManager."""
+        """
+        Execute actions directly without ActionManager.
+        
+        Actions up to the next one with a wait run concurrently; the wait
+        then applies before the following group starts.
+        """
+        group = []
         for action in actions:
-            try:
-                device = self._resolve_device(action.get('device', 'self'))
-                
-                if device == 'self':
-                    await self._execute_local_action(action)
-                else:
-                    await self._execute_remote_action(device, action)
+            group.append(self._execute_action_directly(action))
+            
+            # Handle wait
+            wait_ms = action.get('wait_after_ms', 0)
+            if wait_ms > 0:
+                await asyncio.gather(*group)
+                group = []
+                await asyncio.sleep(wait_ms / 1000.0)
+        
+        if group:
+            await asyncio.gather(*group)
+    
+    async def _execute_action_directly(self, action: Dict[str, Any]):
+        """Execute a single action directly, logging any failure."""
+        try:
+            device = self._resolve_device(action.get('device', 'self'))
+            
+            if device == 'self':
+                await self._execute_local_action(action)
+            else:
+                await self._execute_remote_action(device, action)
                 
-                # Handle wait
-                wait_ms = action.get('wait_after_ms', 0)
-                if wait_ms > 0:
-                    await asyncio.sleep(wait_ms / 1000.0)
-                    
-            except Exception as e:
-                logger.error(f"Error executing action directly: {e}")
+        except Exception as e:
+            logger.error(f"Error executing action directly: {e}")
     
     async def _execute_local_action(self, action: Dict[str, Any]):
         """Execute action on local component."""
@@ -386,10 +618,7 @@ class WatcherComponent(Component):
         param = None
         
         if param_id is not None:
-            for comp in self.hub.local_components.values():
-                param = comp.get_param_by_id(param_id)
-                if param:
-                    break
+            param = self.hub.local_params_by_id.get(param_id)
         elif component_name and param_name:
             comp = self.hub.local_components.get(component_name)
             if comp:
@@ -424,7 +653,7 @@ class WatcherComponent(Component):
         }
         
         try:
-            await ws.send(json.dumps(request))
+            await ws.send(orjson.dumps(request))
         except Exception as e:
             logger.error(f"Failed to send action to {device_ip}: {e}")
     
@@ -432,7 +661,9 @@ class WatcherComponent(Component):
     
     def set_variable(self, name: str, device: str, component: str, 
                      param: str, row: int = 0, col: int = 0):
-        """Add or update a variable definition."""
+        """Add or update a variable definition (name must be an identifier, not a keyword)."""
+        if not _is_variable_name(name):
+            raise ValueError(f"Invalid variable name: {name!r}")
         self._var_defs[name] = {
             'device': device,
             'component': component,
@@ -440,7 +671,7 @@ class WatcherComponent(Component):
             'row': row,
             'col': col
         }
-        self.variables.set_value(0, 0, json.dumps(self._var_defs))
+        self.variables.set_value(0, 0, orjson.dumps(self._var_defs).decode())
     
     def set_watch(self, slot: int, expression: str, 
                   rising_actions: List[Dict] = None,
@@ -449,18 +680,37 @@ class WatcherComponent(Component):
         self.expressions.set_value(slot, 0, expression)
         
         if rising_actions:
-            self.rising_actions.set_value(slot, 0, json.dumps({'actions': rising_actions}))
+            self.rising_actions.set_value(slot, 0, orjson.dumps({'actions': rising_actions}).decode())
         
         if falling_actions:
-            self.falling_actions.set_value(slot, 0, json.dumps({'actions': falling_actions}))
+            self.falling_actions.set_value(slot, 0, orjson.dumps({'actions': falling_actions}).decode())
     
     def clear_watch(self, slot: int):
         """Clear a watch slot."""
         self.expressions.set_value(slot, 0, "")
         self.rising_actions.set_value(slot, 0, "")
         self.falling_actions.set_value(slot, 0, "")
-        self._prev_results.pop(slot, None)
+        self._prev_mask &= ~(1 << slot)
+        self._known_mask &= ~(1 << slot)
+        self._slot_results.pop(slot, None)
+        self._slots_dirty = True
+        self._needed_vars = None
     
     def get_variable_value(self, name: str) -> Any:
         """Get the current cached value of a variable."""
         return self._var_values.get(name)
+    
+    def _count_eval(self):
+        """Count one evaluation tick, pushing the count to eval_count every few ticks."""
+        self._eval_count_local += 1
+        if self._eval_count_local % EVAL_COUNT_SYNC_TICKS == 0:
+            self._sync_eval_count()
+    
+    def _sync_eval_count(self):
+        """Push the local evaluation counter to the eval_count parameter."""
+        self.eval_count.set_value(0, 0, self._eval_count_local, notify=False)
+    
+    def get_eval_count(self) -> int:
+        """Get the exact number of evaluations performed (eval_count may lag by a few ticks)."""
+        self._sync_eval_count()
+        return self._eval_count_local
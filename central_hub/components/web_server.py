@@ -18,17 +18,31 @@ API Endpoints (same as ESP32):
 - set_param: Set parameter value
 - subscribe: Subscribe to parameter updates
 - unsubscribe: Unsubscribe from parameter updates
+- batch: Handle several of the above in one frame ({"type": "batch", "msgs": [...]})
+
+A parameter cell that changes several times before its update is broadcast is sent
+once, with its latest value. When several outgoing messages are waiting for a client
+they are sent together as one {"type": "batch", "msgs": [...]} frame. Every client
+also receives a {"type": "ping"} keepalive message every KEEPALIVE_INTERVAL_SEC seconds.
+
+Clients that request the "msgpack" WebSocket subprotocol exchange the same messages
+as MessagePack binary frames instead of JSON text frames (requires msgspec).
 """
 
 import asyncio
-import json
 import logging
 import socket
-from typing import Any, Dict, Optional, Set, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Optional, Set, Tuple, Union, TYPE_CHECKING
 
+import orjson
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+try:
+    import msgspec  # MessagePack support for the "msgpack" subprotocol (optional)
+except ImportError:
+    msgspec = None
+
 from .base import Component, IntParameter, StringParameter
 
 if TYPE_CHECKING:
@@ -36,19 +50,95 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('WebServer')
 
+# Outgoing messages buffered per client; a client that falls this far behind is disconnected
+CLIENT_QUEUE_SIZE = 128
+
+# Parameter changes waiting to be broadcast; further changes are dropped while full
+BROADCAST_QUEUE_SIZE = 10_000
+
+# Seconds between application-level keepalive messages to each client
+KEEPALIVE_INTERVAL_SEC = 30
+
+# Seconds between pushes of the message counter to the total_messages parameter
+STATS_INTERVAL_SEC = 1.0
+
+# Keepalive message, encoded once
+_PING_MESSAGE = '{"type":"ping"}'
+
+_loads = orjson.loads
+_dumps = orjson.dumps
+
+# Subprotocol for MessagePack (binary) clients; clients that request none get JSON
+MSGPACK_SUBPROTOCOL = 'msgpack'
+
+if msgspec is not None:
+    # One encoder/decoder for all connections; requests must be maps, so anything
+    # else is rejected while decoding
+    _pack = msgspec.msgpack.Encoder().encode
+    _unpack = msgspec.msgpack.Decoder().decode
+    _unpack_request = msgspec.msgpack.Decoder(Dict[str, Any]).decode
+    _DECODE_ERRORS: Tuple[type, ...] = (orjson.JSONDecodeError, msgspec.DecodeError)
+    
+    # Encoded once: keepalive, the "id" key, and a batch frame up to (not including)
+    # its msgs array header
+    _PING_MSGPACK = _pack({'type': 'ping'})
+    _MSGPACK_ID_KEY = _pack('id')
+    _MSGPACK_BATCH_PREFIX = _pack({'type': 'batch', 'msgs': []})[:-1]
+else:
+    _DECODE_ERRORS = (orjson.JSONDecodeError,)
+
+
+# Shared empty result for cells nobody is subscribed to
+_NO_SUBSCRIBERS: Set[Any] = frozenset()
+
+
+def _encode(obj: Any) -> str:
+    """Serialize a message for a text frame (browser clients JSON.parse the frame data)."""
+    return _dumps(obj).decode()
+
+
+def _with_id(encoded: str, msg_id: Any) -> str:
+    """Add an "id" member to a pre-encoded (non-empty) JSON object."""
+    return f'{encoded[:-1]},"id":{_encode(msg_id)}}}'
+
+
+def _msgpack_with_id(encoded: bytes, msg_id: Any) -> bytes:
+    """Add an "id" member to a pre-encoded MessagePack map."""
+    head = encoded[0]
+    if 0x80 <= head < 0x8f:
+        # fixmap with room for one more entry: bump the count and append the pair
+        return bytes((head + 1,)) + encoded[1:] + _MSGPACK_ID_KEY + _pack(msg_id)
+    decoded = _unpack(encoded)
+    decoded['id'] = msg_id
+    return _pack(decoded)
+
+
+def _msgpack_batch(parts: list) -> bytes:
+    """Join pre-encoded MessagePack messages into one batch message."""
+    n = len(parts)
+    header = bytes((0x90 | n,)) if n < 16 else b'\xdc' + n.to_bytes(2, 'big')
+    return _MSGPACK_BATCH_PREFIX + header + b''.join(parts)
+
+
+def _sub_key(param_id: int, row: int, col: int) -> int:
+    """Pack a subscribed cell into one int key (param_id:32 | row:16 | col:16)."""
+    if not (0 <= row <= 0xFFFF and 0 <= col <= 0xFFFF):
+        raise ValueError(f"cell [{row}][{col}] out of range")
+    return (param_id << 32) | (row << 16) | col
+
 
 class SubscriptionManager:
     """Manages WebSocket subscriptions to parameters."""
     
     def __init__(self):
-        # Maps websocket -> set of (param_id, row, col) subscriptions
-        self._subscriptions: Dict[WebSocketServerProtocol, Set[Tuple[int, int, int]]] = {}
-        # Maps (param_id, row, col) -> set of websockets
-        self._param_subscribers: Dict[Tuple[int, int, int], Set[WebSocketServerProtocol]] = {}
+        # Maps websocket -> set of packed (param_id, row, col) subscription keys
+        self._subscriptions: Dict[WebSocketServerProtocol, Set[int]] = {}
+        # Maps packed (param_id, row, col) key -> set of websockets
+        self._param_subscribers: Dict[int, Set[WebSocketServerProtocol]] = {}
     
     def subscribe(self, ws: WebSocketServerProtocol, param_id: int, row: int, col: int):
         """Subscribe a websocket to a parameter."""
-        key = (param_id, row, col)
+        key = _sub_key(param_id, row, col)
         
         if ws not in self._subscriptions:
             self._subscriptions[ws] = set()
@@ -62,7 +152,10 @@ class SubscriptionManager:
     
     def unsubscribe(self, ws: WebSocketServerProtocol, param_id: int, row: int, col: int):
         """Unsubscribe a websocket from a parameter."""
-        key = (param_id, row, col)
+        try:
+            key = _sub_key(param_id, row, col)
+        except ValueError:
+            return  # Could never have been subscribed
         
         if ws in self._subscriptions:
             self._subscriptions[ws].discard(key)
@@ -84,7 +177,7 @@ class SubscriptionManager:
     
     def get_subscribers(self, param_id: int, row: int, col: int) -> Set[WebSocketServerProtocol]:
         """Get all websockets subscribed to a parameter."""
-        return self._param_subscribers.get((param_id, row, col), set())
+        return self._param_subscribers.get(_sub_key(param_id, row, col), _NO_SUBSCRIBERS)
 
 
 class WebServerComponent(Component):
@@ -95,7 +188,7 @@ class WebServerComponent(Component):
         - port (int): The port the server is listening on
         - local_ip (string): The IP address of this machine  
         - connected_clients (int): Number of currently connected clients
-        - total_messages (int): Total number of messages handled
+        - total_messages (int): Total number of messages handled (updated every STATS_INTERVAL_SEC)
     """
     
     def __init__(self, port: int = 8080):
@@ -138,25 +231,71 @@ class WebServerComponent(Component):
         
         # Internal state
         self.server = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._stats_task: Optional[asyncio.Task] = None
+        self._broadcaster_task: Optional[asyncio.Task] = None
+        
+        # (param_id, row, col, value) changes, fanned out to subscribers by _broadcast_loop
+        self._broadcast_queue: asyncio.Queue = asyncio.Queue(maxsize=BROADCAST_QUEUE_SIZE)
+        
+        # Messages handled; total_messages is synced from this by _stats_loop
+        self._total_messages = 0
         self.subscriptions = SubscriptionManager()
         self._clients: Set[WebSocketServerProtocol] = set()
+        self._msgpack_clients: Set[WebSocketServerProtocol] = set()
         self._running = False
+        
+        # Outgoing message queue per client, drained by that client's writer task
+        self._out_queues: Dict[WebSocketServerProtocol, asyncio.Queue] = {}
+        
+        # Pre-encoded metadata responses, each with the component/parameter count it was
+        # built from (components and parameters are only ever added, so a count change
+        # means the cached body is stale)
+        self._components_response: Optional[Tuple[int, str]] = None
+        self._component_params_responses: Dict[str, Tuple[int, str]] = {}
+        
+        # Parameter metadata by param_id (immutable once a parameter is registered):
+        # the get_component_params entry, and the encoded get_param_info response
+        self._param_meta: Dict[int, dict] = {}
+        self._param_info_responses: Dict[int, str] = {}
+        
+        # MessagePack encodings of cached JSON responses, keyed by the JSON string
+        self._msgpack_responses: Dict[str, bytes] = {}
+        
+        # Request handlers by message type
+        self._handlers = {
+            'get_components': self._handle_get_components,
+            'get_component_params': self._handle_get_component_params,
+            'get_param_info': self._handle_get_param_info,
+            'get_param': self._handle_get_param,
+            'set_param': self._handle_set_param,
+            'SET': self._handle_set_param,
+            'subscribe': self._handle_subscribe,
+            'unsubscribe': self._handle_unsubscribe,
+            'batch': self._handle_batch,
+        }
     
     def _get_local_ip(self) -> str:
-        """Get the local IP address of this machine."""
+        """Get the local IP address of this machine (blocking; may hit the network stack)."""
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             s.connect(("8.8.8.8", 80))
             ip = s.getsockname()[0]
             s.close()
             return ip
+        except Exception:
+            pass
+        # No default route; fall back to whatever the hostname resolves to
+        try:
+            return socket.gethostbyname(socket.gethostname())
         except Exception:
             return "127.0.0.1"
     
     async def initialize(self):
         """Initialize the component."""
-        # Update IP in case it changed
-        self._local_ip = self._get_local_ip()
+        # Update IP in case it changed, off the event loop
+        loop = asyncio.get_running_loop()
+        self._local_ip = await loop.run_in_executor(None, self._get_local_ip)
         self.local_ip_param.set_value(0, 0, self._local_ip, notify=False)
         logger.info("WebServer component initialized")
     
@@ -166,14 +305,19 @@ class WebServerComponent(Component):
         
         # Set up parameter change callbacks for broadcasting
         self._setup_broadcast_callbacks()
+        self._build_metadata_index()
         
         self.server = await websockets.serve(
             self._handle_client,
             '0.0.0.0',
             self._port,
-            ping_interval=30,
-            ping_timeout=10
+            ping_interval=None,  # Replaced by _keepalive_loop
+            ping_timeout=None,
+            subprotocols=[MSGPACK_SUBPROTOCOL, 'json'] if msgspec is not None else None
         )
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+        self._stats_task = asyncio.create_task(self._stats_loop())
+        self._broadcaster_task = asyncio.create_task(self._broadcast_loop())
         
         logger.info(f"WebSocket server started at ws://{self._local_ip}:{self._port}/ws")
         
@@ -187,57 +331,198 @@ class WebServerComponent(Component):
     async def stop(self):
         """Stop the WebSocket server."""
         self._running = False
+        for task in (self._keepalive_task, self._stats_task, self._broadcaster_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.total_messages_param.set_value(0, 0, self._total_messages, notify=True)
         if self.server:
             self.server.close()
             await self.server.wait_closed()
         logger.info("WebSocket server stopped")
     
+    async def _keepalive_loop(self):
+        """
+        Periodically queue a ping message to every client.
+        
+        The regular traffic keeps idle connections open through NATs and proxies, and
+        a dead peer shows up as a failed send (or a full queue) in its writer.
+        """
+        while self._running:
+            await asyncio.sleep(KEEPALIVE_INTERVAL_SEC)
+            for ws in list(self._out_queues):
+                self._enqueue(ws, _PING_MSGPACK if ws in self._msgpack_clients else _PING_MESSAGE)
+    
+    async def _stats_loop(self):
+        """Periodically publish the message counter to total_messages."""
+        while self._running:
+            await asyncio.sleep(STATS_INTERVAL_SEC)
+            # No-op (and no notification) when the count hasn't changed
+            self.total_messages_param.set_value(0, 0, self._total_messages, notify=True)
+    
     def _setup_broadcast_callbacks(self):
         """Set up onChange callbacks on all parameters to broadcast updates."""
         if not self.hub:
             return
             
+        queue = self._broadcast_queue
+        put = queue.put_nowait
         for comp in self.hub.local_components.values():
             for param in comp.parameters.values():
                 param_id = param.param_id
                 
                 def make_callback(pid):
                     def callback(p, row, col, new_value, old_value):
-                        asyncio.create_task(self._broadcast_update(pid, row, col, new_value))
+                        try:
+                            put((pid, row, col, new_value))
+                        except asyncio.QueueFull:
+                            # Drop the oldest change, not this one: the latest value of a
+                            # cell must get through, or subscribers keep a stale value
+                            queue.get_nowait()
+                            put((pid, row, col, new_value))
+                            logger.warning("Broadcast queue full, dropped oldest update (param %s changed)", pid)
                     return callback
                 
                 param.on_change(make_callback(param_id))
     
-    async def _broadcast_update(self, param_id: int, row: int, col: int, value: Any):
+    def _build_metadata_index(self):
+        """Precompute metadata responses for every local parameter."""
+        if not self.hub:
+            return
+        for param in self.hub.local_params_by_id.values():
+            self._param_info_response(param)
+    
+    def _param_metadata(self, param) -> dict:
+        """Metadata entry for a parameter, as listed by get_component_params."""
+        meta = self._param_meta.get(param.param_id)
+        if meta is None:
+            meta = {
+                'name': param.name,
+                'id': param.param_id,
+                'type': param.param_type.value,
+                'rows': param.rows,
+                'cols': param.cols,
+                'readOnly': param.read_only
+            }
+            
+            # Add min/max for numeric types
+            if hasattr(param, 'min_val'):
+                meta['min'] = param.min_val
+            if hasattr(param, 'max_val'):
+                meta['max'] = param.max_val
+            
+            self._param_meta[param.param_id] = meta
+        return meta
+    
+    def _param_info_response(self, param) -> str:
+        """Encoded get_param_info response for a parameter (same fields, keyed 'param_id')."""
+        encoded = self._param_info_responses.get(param.param_id)
+        if encoded is None:
+            meta = self._param_metadata(param)
+            encoded = _encode({('param_id' if k == 'id' else k): v for k, v in meta.items()})
+            self._param_info_responses[param.param_id] = encoded
+        return encoded
+    
+    async def _broadcast_loop(self):
+        """
+        Fan out queued parameter changes to their subscribers.
+        
+        Everything queued since the last pass is handled together, and a cell that
+        changed several times is only broadcast once, with its latest value.
+        """
+        queue = self._broadcast_queue
+        while True:
+            param_id, row, col, value = await queue.get()
+            latest = {(param_id, row, col): value}
+            while not queue.empty():
+                param_id, row, col, value = queue.get_nowait()
+                latest[param_id, row, col] = value
+            
+            for (param_id, row, col), value in latest.items():
+                try:
+                    self._broadcast_update(param_id, row, col, value)
+                except Exception as e:
+                    # Only this update is lost; the loop keeps serving the others
+                    logger.error("Failed to broadcast param %s[%s][%s]: %s", param_id, row, col, e)
+    
+    def _broadcast_update(self, param_id: int, row: int, col: int, value: Any):
         """Broadcast a parameter update to all subscribers."""
         subscribers = self.subscriptions.get_subscribers(param_id, row, col)
         if not subscribers:
             return
         
-        message = json.dumps({
+        update = {
             'type': 'param_update',
             'param_id': param_id,
             'row': row,
             'col': col,
             'value': value
-        })
+        }
+        # Encoded at most once per wire format
+        message = packed = None
         
-        # Send to all subscribers
-        dead_clients = []
-        for ws in subscribers:
+        # Hand off to each subscriber's writer; never waits on a slow client
+        for ws in list(subscribers):  # Snapshot: overflow removes clients
+            if ws in self._msgpack_clients:
+                if packed is None:
+                    packed = _pack(update)
+                self._enqueue(ws, packed)
+            else:
+                if message is None:
+                    message = _encode(update)
+                self._enqueue(ws, message)
+    
+    def _to_msgpack(self, encoded: str) -> bytes:
+        """MessagePack encoding of a cached JSON response."""
+        packed = self._msgpack_responses.get(encoded)
+        if packed is None:
+            packed = _pack(_loads(encoded))
+            self._msgpack_responses[encoded] = packed
+        return packed
+    
+    def _enqueue(self, ws: WebSocketServerProtocol, message: Union[str, bytes]):
+        """Queue a message for a client, disconnecting it if its queue is full."""
+        queue = self._out_queues.get(ws)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"Client {ws.remote_address} is not keeping up, disconnecting")
+            self._remove_client(ws)
+            asyncio.create_task(ws.close(1008, 'send queue full'))
+    
+    async def _writer(self, ws: WebSocketServerProtocol, queue: asyncio.Queue):
+        """Send queued messages to one client, in order, merging any backlog into one frame."""
+        while True:
+            message = await queue.get()
+            if not queue.empty():
+                parts = [message]
+                while not queue.empty():
+                    parts.append(queue.get_nowait())
+                # Queued messages are already-encoded objects, so splice them directly
+                if isinstance(message, bytes):
+                    message = _msgpack_batch(parts)
+                else:
+                    message = '{"type":"batch","msgs":[' + ','.join(parts) + ']}'
             try:
                 await ws.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                dead_clients.append(ws)
-        
-        # Clean up dead connections
-        for ws in dead_clients:
-            self._remove_client(ws)
+            except (websockets.exceptions.ConnectionClosed, OSError):
+                # Closed, or the transport failed underneath (e.g. reset by peer)
+                self._remove_client(ws)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to send to {ws.remote_address}: {e}")
     
     def _remove_client(self, ws):
         """Remove a client and update the count."""
         self.subscriptions.remove_client(ws)
+        self._out_queues.pop(ws, None)
         self._clients.discard(ws)
+        self._msgpack_clients.discard(ws)
         self.connected_clients_param.set_value(0, 0, len(self._clients), notify=True)
     
     async def _handle_client(self, websocket):
@@ -247,280 +532,285 @@ class WebServerComponent(Component):
         
         client_addr = websocket.remote_address
         path = websocket.path if hasattr(websocket, 'path') else '/ws'
-        logger.info(f"Client connected: {client_addr} (path: {path})")
+        binary = websocket.subprotocol == MSGPACK_SUBPROTOCOL
+        logger.info(f"Client connected: {client_addr} (path: {path}, "
+                    f"{'msgpack' if binary else 'json'})")
+        
+        # Wire format for this connection
+        if binary:
+            self._msgpack_clients.add(websocket)
+            decode, encode, with_id = _unpack_request, _pack, _msgpack_with_id
+            from_cache = self._to_msgpack
+        else:
+            decode, encode, with_id = _loads, _encode, _with_id
+            from_cache = None
+        
+        # Responses go through the same queue as broadcasts so the client sees them in order
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._out_queues[websocket] = queue
+        writer_task = asyncio.create_task(self._writer(websocket, queue))
         
         try:
             async for message in websocket:
                 try:
-                    # Increment message counter
-                    total = self.total_messages_param.get_value(0, 0)
-                    self.total_messages_param.set_value(0, 0, total + 1, notify=False)
+                    # Count the message (published by _stats_loop)
+                    self._total_messages += 1
                     
-                    request = json.loads(message)
+                    request = decode(message)
                     response = await self._handle_message(websocket, request)
                     
                     if response:
-                        # Add request ID to response if present in request
-                        if 'id' in request:
-                            response['id'] = request['id']
-                        await websocket.send(json.dumps(response))
+                        if isinstance(response, str):
+                            # Cached, already-encoded response
+                            if from_cache is not None:
+                                response = from_cache(response)
+                            if 'id' in request:
+                                response = with_id(response, request['id'])
+                            self._enqueue(websocket, response)
+                        else:
+                            # Add request ID to response if present in request
+                            if 'id' in request:
+                                response['id'] = request['id']
+                            self._enqueue(websocket, encode(response))
                         
-                except json.JSONDecodeError:
-                    error_response = {'error': 'Invalid JSON'}
-                    await websocket.send(json.dumps(error_response))
+                except _DECODE_ERRORS:
+                    error_response = {'error': 'Invalid MessagePack' if binary else 'Invalid JSON'}
+                    self._enqueue(websocket, encode(error_response))
                 except Exception as e:
                     logger.error(f"Error handling message: {e}")
                     error_response = {'error': str(e)}
-                    await websocket.send(json.dumps(error_response))
+                    self._enqueue(websocket, encode(error_response))
                     
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
+            writer_task.cancel()
+            try:
+                await writer_task
+            except asyncio.CancelledError:
+                pass
             self._remove_client(websocket)
             logger.info(f"Client disconnected: {client_addr}")
     
     async def _handle_message(self, websocket: WebSocketServerProtocol, 
-                               request: dict) -> Optional[dict]:
-        """Handle a WebSocket message and return response."""
+                               request: dict) -> Optional[Union[dict, str]]:
+        """
+        Handle a WebSocket message and return response.
+        
+        Cacheable responses are returned already encoded, as a JSON object string.
+        """
         msg_type = request.get('type')
         
         if not msg_type:
             return {'error': 'missing type field'}
         
-        logger.debug(f"Handling message type: {msg_type}")
+        logger.debug("Handling message type: %s", msg_type)
+        
+        handler = self._handlers.get(msg_type)
+        if handler is None:
+            return {'error': f'unknown message type: {msg_type}'}
+        return await handler(websocket, request)
+    
+    def _find_param(self, request: dict):
+        """Find the local parameter a get/set request refers to, or None."""
+        get = request.get
+        param_id = get('param_id')
+        
+        # Lookup by param_id (preferred)
+        if param_id is not None:
+            return self.hub.local_params_by_id.get(param_id)
         
-        # ====================================================================
-        # get_components - List all local components
-        # ====================================================================
-        if msg_type == 'get_components':
+        comp_name = get('comp')
+        if not comp_name:
+            return None
+        param_name = get('param')
+        param_type = get('param_type')
+        idx = get('idx')
+        
+        # Lookup by comp + param name
+        if param_name:
+            comp = self.hub.local_components.get(comp_name)
+            return comp.get_param(param_name) if comp else None
+        # Lookup by comp + param_type + idx (ESP32 compatibility)
+        if param_type is not None and idx is not None:
+            comp = self.hub.local_components.get(comp_name)
+            return comp.get_param_by_type_and_index(param_type, idx) if comp else None
+        return None
+    
+    # ========================================================================
+    # get_components - List all local components
+    # ========================================================================
+    async def _handle_get_components(self, websocket, request: dict):
+        component_ids = self.hub.local_component_ids
+        cached = self._components_response
+        if cached is None or cached[0] != len(component_ids):
             components = []
-            for name, comp in self.hub.local_components.items():
+            for name, comp_id in component_ids.items():
                 components.append({
                     'name': name,
-                    'id': hash(name) & 0xFFFFFFFF  # Generate a pseudo-ID
+                    'id': comp_id
                 })
-            return {'components': components}
-        
-        # ====================================================================
-        # get_component_params - Get all parameters for a component
-        # ====================================================================
-        elif msg_type == 'get_component_params':
-            comp_name = request.get('comp')
-            comp_id = request.get('comp_id')
-            
-            comp = None
-            if comp_name:
-                comp = self.hub.local_components.get(comp_name)
-            elif comp_id is not None:
-                # Find by ID
-                for name, c in self.hub.local_components.items():
-                    if hash(name) & 0xFFFFFFFF == comp_id:
-                        comp = c
-                        comp_name = name
-                        break
-            
-            if not comp:
-                return {'error': 'component not found'}
-            
-            params_list = []
-            for param in comp.parameters.values():
-                param_info = {
-                    'name': param.name,
-                    'id': param.param_id,
-                    'type': param.param_type.value,
-                    'rows': param.rows,
-                    'cols': param.cols,
-                    'readOnly': param.read_only
-                }
-                
-                # Add min/max for numeric types
-                if hasattr(param, 'min_val'):
-                    param_info['min'] = param.min_val
-                if hasattr(param, 'max_val'):
-                    param_info['max'] = param.max_val
-                
-                params_list.append(param_info)
-            
-            return {
-                'component': comp_name,
-                'component_id': hash(comp_name) & 0xFFFFFFFF,
-                'params': params_list
-            }
+            cached = (len(component_ids), _encode({'components': components}))
+            self._components_response = cached
+        return cached[1]
+    
+    # ========================================================================
+    # get_component_params - Get all parameters for a component
+    # ========================================================================
+    async def _handle_get_component_params(self, websocket, request: dict):
+        comp_name = request.get('comp')
+        comp_id = request.get('comp_id')
         
-        # ====================================================================
-        # get_param_info - Old API for one-at-a-time fetching
-        # ====================================================================
-        elif msg_type == 'get_param_info':
-            comp_name = request.get('comp')
-            param_type = request.get('param_type')
-            idx = request.get('idx', -1)
-            
-            if not comp_name or not param_type:
-                return {'error': 'missing comp or param_type'}
-            
+        comp = None
+        if comp_name:
             comp = self.hub.local_components.get(comp_name)
-            if not comp:
-                return {'error': 'component not found'}
-            
-            # Filter parameters by type
-            typed_params = [p for p in comp.parameters.values() 
-                          if p.param_type.value == param_type]
-            
-            if idx == -1:
-                # Return count
-                return {'count': len(typed_params)}
-            
-            if idx < 0 or idx >= len(typed_params):
-                return {'error': 'index out of range'}
-            
-            param = typed_params[idx]
-            response = {
-                'name': param.name,
-                'param_id': param.param_id,
-                'type': param.param_type.value,
-                'rows': param.rows,
-                'cols': param.cols,
-                'readOnly': param.read_only
-            }
-            
-            if hasattr(param, 'min_val'):
-                response['min'] = param.min_val
-            if hasattr(param, 'max_val'):
-                response['max'] = param.max_val
-            
-            return response
-        
-        # ====================================================================
-        # get_param - Get parameter value
-        # ====================================================================
-        elif msg_type == 'get_param':
-            param_id = request.get('param_id')
-            comp_name = request.get('comp')
-            param_name = request.get('param')
-            param_type = request.get('param_type')
-            idx = request.get('idx')
-            row = request.get('row', 0)
-            col = request.get('col', 0)
-            
-            param = None
-            
-            # Lookup by param_id (preferred)
-            if param_id is not None:
-                for comp in self.hub.local_components.values():
-                    param = comp.get_param_by_id(param_id)
-                    if param:
-                        break
-            # Lookup by comp + param name
-            elif comp_name and param_name:
-                comp = self.hub.local_components.get(comp_name)
-                if comp:
-                    param = comp.get_param(param_name)
-            # Lookup by comp + param_type + idx (ESP32 compatibility)
-            elif comp_name and param_type is not None and idx is not None:
-                comp = self.hub.local_components.get(comp_name)
-                if comp:
-                    param = comp.get_param_by_type_and_index(param_type, idx)
-            
-            if not param:
-                return {'error': 'parameter not found'}
-            
-            return {
-                'name': param.name,
-                'id': param.param_id,
-                'type': param.param_type.value,
-                'value': param.get_value(row, col)
-            }
+        elif comp_id is not None:
+            comp = self.hub.local_components_by_id.get(comp_id)
+            if comp:
+                comp_name = comp.name
         
-        # ====================================================================
-        # set_param / SET - Set parameter value (SET is alias used by ActionManager)
-        # ====================================================================
-        elif msg_type in ('set_param', 'SET'):
-            param_id = request.get('param_id')
-            comp_name = request.get('comp')
-            param_name = request.get('param')
-            param_type = request.get('param_type')
-            idx = request.get('idx')
-            row = request.get('row', 0)
-            col = request.get('col', 0)
-            value = request.get('value')
-            
-            if value is None:
-                return {'success': False, 'error': 'missing value field'}
-            
-            param = None
-            
-            # Lookup by param_id (preferred)
-            if param_id is not None:
-                for comp in self.hub.local_components.values():
-                    param = comp.get_param_by_id(param_id)
-                    if param:
-                        break
-            # Lookup by comp + param name
-            elif comp_name and param_name:
-                comp = self.hub.local_components.get(comp_name)
-                if comp:
-                    param = comp.get_param(param_name)
-            # Lookup by comp + param_type + idx (ESP32 compatibility)
-            elif comp_name and param_type is not None and idx is not None:
-                comp = self.hub.local_components.get(comp_name)
-                if comp:
-                    param = comp.get_param_by_type_and_index(param_type, idx)
-            
-            if not param:
-                return {'success': False, 'error': 'parameter not found'}
-            
-            if param.read_only:
-                return {'success': False, 'error': 'parameter is read-only'}
-            
-            try:
-                param.set_value(row, col, value)
-                return {'success': True}
-            except Exception as e:
-                return {'success': False, 'error': str(e)}
-        
-        # ====================================================================
-        # subscribe - Subscribe to parameter updates
-        # ====================================================================
-        elif msg_type == 'subscribe':
-            param_id = request.get('param_id')
-            row = request.get('row', 0)
-            col = request.get('col', 0)
-            
-            if param_id is None:
-                return {'error': 'missing param_id'}
-            
-            # Find the parameter
-            param = None
-            for comp in self.hub.local_components.values():
-                param = comp.get_param_by_id(param_id)
-                if param:
-                    break
-            
-            if not param:
-                return {'error': 'parameter not found'}
-            
-            # Add subscription
-            self.subscriptions.subscribe(websocket, param_id, row, col)
-            
-            # Return current value
-            return {'value': param.get_value(row, col)}
-        
-        # ====================================================================
-        # unsubscribe - Unsubscribe from parameter updates
-        # ====================================================================
-        elif msg_type == 'unsubscribe':
-            param_id = request.get('param_id')
-            row = request.get('row', 0)
-            col = request.get('col', 0)
-            
-            if param_id is None:
-                return {'error': 'missing param_id'}
-            
-            self.subscriptions.unsubscribe(websocket, param_id, row, col)
+        if not comp:
+            return {'error': 'component not found'}
+        
+        cached = self._component_params_responses.get(comp_name)
+        if cached is not None and cached[0] == len(comp.parameters):
+            return cached[1]
+        
+        params_list = [self._param_metadata(param) for param in comp.parameters.values()]
+        
+        encoded = _encode({
+            'component': comp_name,
+            'component_id': self.hub.local_component_ids[comp_name],
+            'params': params_list
+        })
+        self._component_params_responses[comp_name] = (len(comp.parameters), encoded)
+        return encoded
+    
+    # ========================================================================
+    # get_param_info - Old API for one-at-a-time fetching
+    # ========================================================================
+    async def _handle_get_param_info(self, websocket, request: dict):
+        get = request.get
+        comp_name = get('comp')
+        param_type = get('param_type')
+        idx = get('idx', -1)
+        
+        if not comp_name or not param_type:
+            return {'error': 'missing comp or param_type'}
+        
+        comp = self.hub.local_components.get(comp_name)
+        if not comp:
+            return {'error': 'component not found'}
+        
+        # Filter parameters by type
+        typed_params = [p for p in comp.parameters.values() 
+                        if p.param_type.value == param_type]
+        
+        if idx == -1:
+            # Return count
+            return {'count': len(typed_params)}
+        
+        if idx < 0 or idx >= len(typed_params):
+            return {'error': 'index out of range'}
+        
+        return self._param_info_response(typed_params[idx])
+    
+    # ========================================================================
+    # get_param - Get parameter value
+    # ========================================================================
+    async def _handle_get_param(self, websocket, request: dict):
+        param = self._find_param(request)
+        if not param:
+            return {'error': 'parameter not found'}
+        
+        get = request.get
+        return {
+            'name': param.name,
+            'id': param.param_id,
+            'type': param.param_type.value,
+            'value': param.get_value(get('row', 0), get('col', 0))
+        }
+    
+    # ========================================================================
+    # set_param / SET - Set parameter value (SET is alias used by ActionManager)
+    # ========================================================================
+    async def _handle_set_param(self, websocket, request: dict):
+        get = request.get
+        value = get('value')
+        if value is None:
+            return {'success': False, 'error': 'missing value field'}
+        
+        param = self._find_param(request)
+        if not param:
+            return {'success': False, 'error': 'parameter not found'}
+        
+        if param.read_only:
+            return {'success': False, 'error': 'parameter is read-only'}
+        
+        try:
+            param.set_value(get('row', 0), get('col', 0), value)
             return {'success': True}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    # ========================================================================
+    # subscribe - Subscribe to parameter updates
+    # ========================================================================
+    async def _handle_subscribe(self, websocket, request: dict):
+        get = request.get
+        param_id = get('param_id')
+        row = get('row', 0)
+        col = get('col', 0)
         
-        # ====================================================================
-        # Unknown message type
-        # ====================================================================
-        else:
-            return {'error': f'unknown message type: {msg_type}'}
+        if param_id is None:
+            return {'error': 'missing param_id'}
+        
+        # Find the parameter
+        param = self.hub.local_params_by_id.get(param_id)
+        
+        if not param:
+            return {'error': 'parameter not found'}
+        
+        # Add subscription
+        self.subscriptions.subscribe(websocket, param_id, row, col)
+        
+        # Return current value
+        return {'value': param.get_value(row, col)}
+    
+    # ========================================================================
+    # unsubscribe - Unsubscribe from parameter updates
+    # ========================================================================
+    async def _handle_unsubscribe(self, websocket, request: dict):
+        get = request.get
+        param_id = get('param_id')
+        
+        if param_id is None:
+            return {'error': 'missing param_id'}
+        
+        self.subscriptions.unsubscribe(websocket, param_id, get('row', 0), get('col', 0))
+        return {'success': True}
+    
+    # ========================================================================
+    # batch - Handle several requests from a single frame
+    # ========================================================================
+    async def _handle_batch(self, websocket, request: dict):
+        msgs = request.get('msgs')
+        if not isinstance(msgs, list):
+            return {'error': 'missing msgs array'}
+        
+        responses = []
+        for msg in msgs:
+            if not isinstance(msg, dict) or not msg.get('type'):
+                inner = {'error': 'missing type field'}
+            elif msg['type'] == 'batch':
+                inner = {'error': 'nested batch not allowed'}
+            else:
+                inner = await self._handle_message(websocket, msg) or {}
+            
+            if isinstance(inner, str):
+                inner = _loads(inner)  # Cached response; decoded so it can be re-embedded
+            if isinstance(msg, dict) and 'id' in msg:
+                inner['id'] = msg['id']
+            responses.append(inner)
+        
+        return {'type': 'batch', 'responses': responses}
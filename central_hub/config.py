@@ -12,13 +12,22 @@ ESP32_DEVICES = [
 WS_SERVER_PORT = 80 # Port for the hub's WebSocket server (use 80 if running as root)
 
 # WebSocket Client settings (for outgoing connections to ESP32s)
-WS_PING_INTERVAL = 20  # seconds
-WS_PING_TIMEOUT = 20   # seconds
 RECONNECT_DELAY = 5    # seconds
 
-# Rate limiting (to avoid overwhelming ESP32)
-DISCOVERY_DELAY = 0.05   # seconds between param info requests
-SUBSCRIBE_DELAY = 0.02   # seconds between subscribe requests
+# Dead-peer detection uses kernel TCP keepalive instead of WebSocket pings
+TCP_KEEPALIVE_IDLE = 30      # seconds of silence before the first probe
+TCP_KEEPALIVE_INTERVAL = 10  # seconds between probes
+TCP_KEEPALIVE_COUNT = 3      # unanswered probes before the connection drops
+
+# Flow control (to avoid overwhelming ESP32)
+MAX_IN_FLIGHT = 8  # max outstanding requests/batches per device
+PENDING_SLOTS = 1024  # request ID space per device; IDs are recycled (must exceed MAX_IN_FLIGHT * BATCH_SIZE)
+
+# Max queued remote parameter updates awaiting the Watcher (oldest dropped when full)
+UPDATE_BUS_SIZE = 4096
+
+# Request batching: max requests packed into a single {"type": "batch"} frame
+BATCH_SIZE = 32
 
 # Logging level: 'DEBUG', 'INFO', 'WARNING', 'ERROR'
 LOG_LEVEL = 'INFO'
@@ -0,0 +1,54 @@
+"""Tests for Watcher expression compilation and variable definitions."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+
+from components.watcher import WatcherComponent
+
+
+class CompileExpressionTests(unittest.TestCase):
+    def setUp(self):
+        self.watcher = WatcherComponent()
+
+    def test_allows_numbers_booleans_and_names(self):
+        code, names = self.watcher._compile_expression("light < 30.5 and motion == true")
+        self.assertEqual(names, {'light', 'motion'})
+        self.assertTrue(eval(code, {'__builtins__': {}}, {'light': 10, 'motion': True}))
+
+    def test_rejects_string_literal(self):
+        with self.assertRaises(ValueError):
+            self.watcher._compile_expression("'a' * 1000000000")
+
+    def test_rejects_bytes_literal(self):
+        with self.assertRaises(ValueError):
+            self.watcher._compile_expression("b'a' * 1000000000 == x")
+
+    def test_rejects_calls(self):
+        with self.assertRaises(ValueError):
+            self.watcher._compile_expression("__import__('os')")
+
+
+class VariableNameTests(unittest.TestCase):
+    def setUp(self):
+        self.watcher = WatcherComponent()
+
+    def test_set_variable_rejects_non_identifier(self):
+        with self.assertRaises(ValueError):
+            self.watcher.set_variable("temp-1", "self", "Sensor", "temp")
+
+    def test_written_non_identifiers_are_dropped(self):
+        self.watcher.variables.set_value(0, 0, orjson.dumps({
+            'temp_1': {'device': 'self', 'component': 'Sensor', 'param': 'temp'},
+            'temp-1': {'device': 'self', 'component': 'Sensor', 'param': 'temp'},
+            'True': {'device': 'self', 'component': 'Sensor', 'param': 'temp'},
+        }).decode())
+        self.assertEqual(list(self.watcher._var_defs), ['temp_1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
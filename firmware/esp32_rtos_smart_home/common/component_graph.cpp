@@ -2,6 +2,16 @@
 #include "esp_log.h"
 #include "esp_heap_caps.h"
 
+// FNV-1a hash, chained through `hash` so several fields can be mixed in
+static uint32_t fnv1a(const void* data, size_t len, uint32_t hash = 2166136261u) {
+    const uint8_t* bytes = static_cast<const uint8_t*>(data);
+    for (size_t i = 0; i < len; i++) {
+        hash ^= bytes[i];
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
 // Memory logging helper
 static void log_component_memory(const char* component_name, const char* stage) {
     ESP_LOGI("ComponentGraph", "  [%s] %s - Free DRAM: %lu bytes", 
@@ -593,7 +603,34 @@ cJSON* ComponentGraph::executeMessage(cJSON* request) {
         return response;
     }
     
-
+    // ========================================================================
+    // get_catalog_version - Hash of every component/parameter definition
+    // Lets clients skip rediscovery on reconnect when nothing has changed
+    // ========================================================================
+    else if (strcmp(msg_type, "get_catalog_version") == 0) {
+        // Per-parameter hashes are summed so map iteration order doesn't matter
+        uint32_t version = 0;
+        for (const auto& name : getComponentNames()) {
+            Component* comp = getComponent(name);
+            if (!comp) continue;
+            for (const auto& pair : comp->getAllParams()) {
+                BaseParameter* param = pair.second.get();
+                uint32_t id = param->getParameterId();
+                uint32_t dims[2] = {(uint32_t)param->getRows(), (uint32_t)param->getCols()};
+                const char* type = param->getTypeString();
+                uint32_t h = fnv1a(name.data(), name.size());
+                h = fnv1a(param->getName().data(), param->getName().size(), h);
+                h = fnv1a(type, strlen(type), h);
+                h = fnv1a(&id, sizeof(id), h);
+                h = fnv1a(dims, sizeof(dims), h);
+                version += h;
+            }
+        }
+        
+        cJSON* response = cJSON_CreateObject();
+        cJSON_AddNumberToObject(response, "version", version);
+        return response;
+    }
     
     // Unknown message type
     cJSON* error = cJSON_CreateObject();
@@ -340,7 +340,47 @@ esp_err_t WebServerComponent::ws_handler(httpd_req_t *req) {
 // WebSocket message handler - wrapper for executeMessage, handles subscriptions
 cJSON* WebServerComponent::handle_ws_message(cJSON* request, const char* msg_type, int socket_fd) {
     ESP_LOGI(TAG, "Handling WebSocket message from socket %d", socket_fd);
-    
+
+    // Batch: {"type":"batch","msgs":[...]} -> {"type":"batch","responses":[...]}
+    // Each inner message is handled as if it arrived on its own frame, and its
+    // "id" (if any) is copied onto its response so the client can match them up.
+    if (strcmp(msg_type, "batch") == 0) {
+        cJSON* msgs = cJSON_GetObjectItem(request, "msgs");
+        if (!msgs || !cJSON_IsArray(msgs)) {
+            cJSON* error = cJSON_CreateObject();
+            cJSON_AddStringToObject(error, "error", "missing msgs array");
+            return error;
+        }
+
+        cJSON* response = cJSON_CreateObject();
+        cJSON_AddStringToObject(response, "type", "batch");
+        cJSON* responses = cJSON_AddArrayToObject(response, "responses");
+
+        cJSON* msg = nullptr;
+        cJSON_ArrayForEach(msg, msgs) {
+            cJSON* id_item = cJSON_GetObjectItem(msg, "id");
+            cJSON* type_item = cJSON_GetObjectItem(msg, "type");
+
+            cJSON* inner = nullptr;
+            if (!type_item || !cJSON_IsString(type_item)) {
+                inner = cJSON_CreateObject();
+                cJSON_AddStringToObject(inner, "error", "missing type field");
+            } else if (strcmp(type_item->valuestring, "batch") == 0) {
+                inner = cJSON_CreateObject();
+                cJSON_AddStringToObject(inner, "error", "nested batch not allowed");
+            } else {
+                inner = handle_ws_message(msg, type_item->valuestring, socket_fd);
+                if (!inner) inner = cJSON_CreateObject();
+            }
+
+            if (id_item) {
+                cJSON_AddNumberToObject(inner, "id", id_item->valueint);
+            }
+            cJSON_AddItemToArray(responses, inner);
+        }
+        return response;
+    }
+
     // Subscribe/unsubscribe use param_id (UUID) instead of component/type/index
     if (strcmp(msg_type, "subscribe") == 0) {
         cJSON* param_id_item = cJSON_GetObjectItem(request, "param_id");
@@ -1,21 +1,24 @@
 #!/usr/bin/env python3
 import asyncio
+import logging
 import websockets
 
+logger = logging.getLogger("ws-echo-server")
+
 async def echo(websocket):
-    print("Client connected")
+    logger.info("Client connected")
     try:
         async for message in websocket:
-            print(f"Received: {message}")
+            logger.debug("Received: %s", message)
             await websocket.send(message)
-            print("Echoed back")
     except websockets.exceptions.ConnectionClosed:
-        print("Client disconnected")
+        logger.info("Client disconnected")
 
 async def main():
-    print("WebSocket server listening on ws://10.0.0.189:8080")
+    logger.info("WebSocket server listening on ws://10.0.0.189:8080")
     async with websockets.serve(echo, "10.0.0.189", 8080):
         await asyncio.Future()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     asyncio.run(main())
@@ -1,8 +1,35 @@
 """
 WebSocket consumer for real-time parameter updates
+
+Updates come from one upstream WebSocket per ESP32 device (see DeviceUpdateStream),
+shared by every browser subscribed to that device, and are pushed to the browsers
+through channel-layer groups.
 """
-import json
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import orjson
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.layers import get_channel_layer
+
+from .esp32_client import ESP32Device, esp32_manager
+from .models import Device
+
+logger = logging.getLogger(__name__)
+
+# Updates are forwarded at most once per window; a cell that changed several times
+# within it is sent once, with its latest value
+UPDATE_WINDOW_SEC = 0.05
+
+# Seconds to wait before reconnecting a dropped device stream
+STREAM_RECONNECT_SEC = 2.0
+
+
+def _encode(obj) -> str:
+    """Serialize a message for a text frame (browsers JSON.parse the frame data)."""
+    return orjson.dumps(obj).decode()
 
 
 class ParameterUpdateConsumer(AsyncWebsocketConsumer):
@@ -10,19 +37,22 @@ class ParameterUpdateConsumer(AsyncWebsocketConsumer):
         """Handle WebSocket connection"""
         await self.accept()
         self.subscriptions = set()  # Track which device/component pairs we're subscribed to
-        print(f"[WS] Client connected: {self.channel_name}")
+        self.streams = {}  # (device, component) -> the DeviceUpdateStream it is attached to
+        logger.debug("Client connected: %s", self.channel_name)
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
         # Leave all subscription groups
         for group_name in self.subscriptions:
             await self.channel_layer.group_discard(group_name, self.channel_name)
-        print(f"[WS] Client disconnected: {self.channel_name}")
+        for (device, component), stream in self.streams.items():
+            stream.detach(component)
+        logger.debug("Client disconnected: %s", self.channel_name)
 
     async def receive(self, text_data):
         """Handle incoming WebSocket messages from browser"""
         try:
-            data = json.loads(text_data)
+            data = orjson.loads(text_data)
             action = data.get('action')
             
             if action == 'subscribe':
@@ -33,9 +63,15 @@ class ParameterUpdateConsumer(AsyncWebsocketConsumer):
                     group_name = f"param_updates_{device}_{component}"
                     await self.channel_layer.group_add(group_name, self.channel_name)
                     self.subscriptions.add(group_name)
-                    print(f"[WS] Subscribed to {group_name}")
+                    logger.debug("Subscribed to %s", group_name)
                     
-                    await self.send(text_data=json.dumps({
+                    if (device, component) not in self.streams:
+                        stream = await _get_stream(device)
+                        if stream is not None:
+                            stream.attach(component)
+                            self.streams[device, component] = stream
+                    
+                    await self.send(text_data=_encode({
                         'type': 'subscription_confirmed',
                         'device': device,
                         'component': component
@@ -49,28 +85,169 @@ class ParameterUpdateConsumer(AsyncWebsocketConsumer):
                     group_name = f"param_updates_{device}_{component}"
                     await self.channel_layer.group_discard(group_name, self.channel_name)
                     self.subscriptions.discard(group_name)
-                    print(f"[WS] Unsubscribed from {group_name}")
+                    logger.debug("Unsubscribed from %s", group_name)
+                    
+                    stream = self.streams.pop((device, component), None)
+                    if stream is not None:
+                        stream.detach(component)
                     
-                    await self.send(text_data=json.dumps({
+                    await self.send(text_data=_encode({
                         'type': 'unsubscription_confirmed',
                         'device': device,
                         'component': component
                     }))
                     
-        except json.JSONDecodeError:
-            print(f"[WS] Invalid JSON received: {text_data}")
+        except orjson.JSONDecodeError:
+            logger.warning("Invalid JSON received: %s", text_data)
         except Exception as e:
-            print(f"[WS] Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
 
     async def param_update(self, event):
         """Handle parameter update broadcast from channel layer"""
-        # Forward the update to the WebSocket client
-        await self.send(text_data=json.dumps({
-            'type': 'param_update',
-            'component': event['component'],
-            'param_type': event['param_type'],
-            'idx': event['idx'],
-            'row': event['row'],
-            'col': event['col'],
-            'value': event['value']
-        }))
+        # Forward the update to the WebSocket client, encoded once by the publisher if possible
+        payload = event.get('payload')
+        if payload is None:
+            payload = _encode({
+                'type': 'param_update',
+                'component': event['component'],
+                'param_type': event['param_type'],
+                'idx': event['idx'],
+                'row': event['row'],
+                'col': event['col'],
+                'value': event['value']
+            })
+        await self.send(text_data=payload)
+
+
+async def publish_param_update(channel_layer, device, component, param_type, idx, row, col, value):
+    """
+    Broadcast a parameter update to every client subscribed to device/component.
+    
+    The client message is encoded here once and carried in the event, so each
+    subscriber's consumer forwards it without re-serializing.
+    """
+    payload = _encode({
+        'type': 'param_update',
+        'component': component,
+        'param_type': param_type,
+        'idx': idx,
+        'row': row,
+        'col': col,
+        'value': value
+    })
+    await channel_layer.group_send(f"param_updates_{device}_{component}", {
+        'type': 'param.update',
+        'payload': payload,
+    })
+
+
+class DeviceUpdateStream:
+    """
+    Live parameter updates from one ESP32 device, shared by every consumer.
+    
+    Holds a single upstream connection (ESP32Device.stream_updates) for the components
+    consumers are attached to, and publishes coalesced updates to their groups every
+    UPDATE_WINDOW_SEC. The connection is reopened when the set of components changes.
+    """
+    
+    def __init__(self, name: str, device: ESP32Device):
+        self.name = name
+        self.device = device
+        self.components: Dict[str, int] = {}  # component -> number of attached consumers
+        self._task: Optional[asyncio.Task] = None
+    
+    def attach(self, component: str):
+        count = self.components.get(component, 0)
+        self.components[component] = count + 1
+        if count == 0:
+            self._restart()
+    
+    def detach(self, component: str):
+        count = self.components.get(component, 0) - 1
+        if count > 0:
+            self.components[component] = count
+            return
+        self.components.pop(component, None)
+        self._restart()
+    
+    def set_device(self, device: ESP32Device):
+        """Stream from a device object that replaced this one (e.g. re-registered with a new address)"""
+        self.device = device
+        self._restart()
+    
+    def stop(self):
+        """Close the upstream connection for good (the device was deleted)"""
+        self.components.clear()
+        self._restart()
+    
+    def _restart(self):
+        if self._task:
+            self._task.cancel()
+        self._task = None
+        if self.components:
+            self._task = asyncio.create_task(self._run(list(self.components)))
+    
+    async def _run(self, components):
+        """Stream updates (reconnecting as needed) while forwarding them in windows"""
+        latest = {}  # (component, param_type, idx, row, col) -> value
+        forwarder = asyncio.create_task(self._forward(latest))
+        try:
+            while True:
+                try:
+                    async for update in self.device.stream_updates(components):
+                        key = (update['component'], update['param_type'], update['idx'],
+                               update['row'], update['col'])
+                        latest[key] = update['value']
+                    logger.warning("Update stream from %s closed", self.name)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Update stream from %s failed: %s", self.name, e)
+                await asyncio.sleep(STREAM_RECONNECT_SEC)
+        finally:
+            forwarder.cancel()
+    
+    async def _forward(self, latest):
+        """Every UPDATE_WINDOW_SEC, publish the cells that changed (latest value each)"""
+        channel_layer = get_channel_layer()
+        while True:
+            await asyncio.sleep(UPDATE_WINDOW_SEC)
+            if not latest:
+                continue
+            pending = dict(latest)
+            latest.clear()
+            for (component, param_type, idx, row, col), value in pending.items():
+                await publish_param_update(channel_layer, self.name, component, param_type,
+                                           idx, row, col, value)
+
+
+# Device name -> its update stream (one per process)
+_streams: Dict[str, DeviceUpdateStream] = {}
+
+
+async def _get_stream(name: str) -> Optional[DeviceUpdateStream]:
+    """
+    Get the update stream for a registered device, or None if there's no such device
+    
+    The stream follows the device object esp32_manager currently holds for the name.
+    """
+    device = esp32_manager.get_device(name)
+    if device is None:
+        info = await database_sync_to_async(
+            lambda: Device.objects.filter(name=name).values('host', 'port').first()
+        )()
+        if info is None:
+            stream = _streams.pop(name, None)
+            if stream is not None:
+                stream.stop()
+            return None
+        # Another consumer may have registered it while we waited
+        device = esp32_manager.get_device(name) or esp32_manager.add_device(name, info['host'], info['port'])
+    
+    # No awaits from here on, so concurrent subscribers share one stream
+    stream = _streams.get(name)
+    if stream is None:
+        stream = _streams[name] = DeviceUpdateStream(name, device)
+    elif stream.device is not device:
+        stream.set_device(device)
+    return stream
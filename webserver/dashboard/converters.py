@@ -0,0 +1,19 @@
+"""
+URL path converters
+
+Device and component names are short identifiers, so their URL segments are matched
+strictly: a path that can't name a device fails in the resolver rather than in a view.
+"""
+
+# Characters allowed in device and component names (DeviceForm validates new names with it)
+NAME_PATTERN = r'[A-Za-z0-9_\-]{1,64}'
+
+
+class NameConverter:
+    regex = NAME_PATTERN
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
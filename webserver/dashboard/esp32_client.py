@@ -1,76 +1,376 @@
 """
 ESP32 Communication Manager
-Handles HTTP REST API communication with ESP32 web server
+Handles communication with the ESP32 web server: component metadata, batched reads and
+live updates go over its WebSocket (/ws); single reads/writes use the HTTP REST API
+
+All device calls are coroutines, so a view can fan out requests to one or
+more devices concurrently, e.g. with asyncio.gather().
 """
-import requests
-import json
-from typing import Dict, Any, Optional, List
+import asyncio
+import contextlib
+import logging
+import socket
+import threading
+import time
+import weakref
+from typing import Dict, Any, AsyncIterator, Optional, List, Tuple
+
+import aiohttp
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Total time allowed for one ESP32 request (seconds)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Connection pool: total / per-device connections, and how long idle connections are
+# kept open for reuse (seconds) so back-to-back calls skip the TCP handshake.
+# The ESP32's httpd has only max_open_sockets (2), and closes the least recently used one
+# to accept another. An update stream (see stream_updates, outside this pool) or a browser
+# holds one, so the pool takes at most one more and lets it go soon after it goes idle,
+# rather than parking sockets the device will drop and the next call would fail on
+POOL_LIMIT = 50
+POOL_LIMIT_PER_HOST = 1
+KEEPALIVE_TIMEOUT_SEC = 1
+
+# GET requests answered with one of these statuses are retried, with exponential backoff
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_RETRIES = 2
+RETRY_BACKOFF_SEC = 0.1
+
+# Circuit breaker: after this many consecutive failed requests a device is treated as
+# offline, and calls fail immediately for BREAKER_OPEN_SEC before it is tried again
+BREAKER_FAILURES = 3
+BREAKER_OPEN_SEC = 10.0
+
+# Timeout for the background pre-connect made when a device is added (seconds)
+WARM_UP_TIMEOUT_SEC = 2
+
+# Requests per batch frame on the device WebSocket (keeps each ESP32 response small)
+WS_BATCH_SIZE = 8
+
+# How long component lists and parameter info are reused before asking the device again
+META_CACHE_TTL_SEC = 30.0
+
+# get_param_value calls made within this window are read together by one batch_get
+BATCH_WINDOW_SEC = 0.005
+
+# One HTTP session (and connection pool) per event loop, shared by all devices
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _encode(obj) -> str:
+    """Serialize a request body / WebSocket message"""
+    return orjson.dumps(obj).decode()
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the shared session for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                limit_per_host=POOL_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT_SEC
+            ),
+            headers={'Content-Type': 'application/json', 'Connection': 'keep-alive',
+                     'Accept-Encoding': 'gzip'},  # Responses are decompressed by aiohttp
+            timeout=REQUEST_TIMEOUT,
+            json_serialize=_encode
+        )
+        _sessions[loop] = session
+    return session
+
+
+class DeviceUnavailable(Exception):
+    """Raised instead of contacting a device whose circuit breaker is open"""
+
+
+def _is_device_failure(error: Exception) -> bool:
+    """Whether an error means the device is unreachable or failing (vs. a bad request)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
 
 
 class ESP32Device:
     """Represents a single ESP32 device connection via HTTP REST API"""
     
-    def __init__(self, host: str, port: int = 80):
+    def __init__(self, host: str, port: int = 80, base_url: Optional[str] = None):
         self.host = host
         self.port = port
-        self.base_url = f"http://{host}:{port}"
-        self.session = requests.Session()
-        self.session.headers.update({'Content-Type': 'application/json'})
+        self.base_url = base_url or f"http://{host}:{port}"
+        
+        # get_param_value calls waiting for the batch window to close: (op, future)
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()  # Keeps background tasks (flushes, warm-up) referenced
+        
+        # Circuit breaker state: consecutive failures, and when calls may reach the device again
+        self._fail_streak = 0
+        self._open_until = 0.0
+        
+        # get_components / get_param_info results: key -> (time fetched, result)
+        self._meta_cache: Dict[tuple, Tuple[float, Any]] = {}
+    
+    def _record_failure(self, error: Exception):
+        """Count a failed call toward the circuit breaker if it means the device is failing"""
+        if _is_device_failure(error):
+            self._fail_streak += 1
+            if self._fail_streak >= BREAKER_FAILURES:
+                self._open_until = time.monotonic() + BREAKER_OPEN_SEC
+    
+    async def _request_json(self, method: str, path: str, **kwargs) -> Any:
+        """Send a request to the device and return its decoded JSON body"""
+        if not self.available:
+            raise DeviceUnavailable(f"{self.host} is offline")
+        session = _get_session()
+        retries = MAX_RETRIES if method == 'GET' else 0  # POSTs may not be idempotent
+        try:
+            for attempt in range(retries + 1):
+                async with session.request(method, self.base_url + path, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        await asyncio.sleep(RETRY_BACKOFF_SEC * 2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    # Parse the raw bytes directly (whatever content type the device reports)
+                    data = orjson.loads(await response.read())
+                    break
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        self._fail_streak = 0
+        return data
+    
+    @contextlib.asynccontextmanager
+    async def _open_ws(self) -> AsyncIterator[aiohttp.ClientWebSocketResponse]:
+        """Open the device WebSocket (ws://host:port/ws), with the same circuit breaker as _request_json"""
+        if not self.available:
+            raise DeviceUnavailable(f"{self.host} is offline")
+        try:
+            async with _get_session().ws_connect(f"ws://{self.host}:{self.port}/ws") as ws:
+                yield ws
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        self._fail_streak = 0
+    
+    async def _ws_batch(self, ws: aiohttp.ClientWebSocketResponse,
+                        msgs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send requests on an open device WebSocket and return their responses in order
+        
+        Requests go out WS_BATCH_SIZE per batch frame, one frame at a time; other frames
+        arriving meanwhile (subscription pushes) are skipped.
+        """
+        responses = []
+        for frame_id, start in enumerate(range(0, len(msgs), WS_BATCH_SIZE)):
+            chunk = msgs[start:start + WS_BATCH_SIZE]
+            await ws.send_json({'type': 'batch', 'id': frame_id, 'msgs': chunk}, dumps=_encode)
+            while True:
+                msg = await ws.receive(timeout=REQUEST_TIMEOUT.total)
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    raise ConnectionError(f"WebSocket closed by {self.host}")
+                reply = orjson.loads(msg.data)
+                if reply.get('id') == frame_id:
+                    break
+            chunk_responses = reply.get('responses', [])
+            # Pad a short reply so every request gets a response
+            responses.extend(chunk_responses + [{}] * (len(chunk) - len(chunk_responses)))
+        return responses
+    
+    @property
+    def available(self) -> bool:
+        """False while the circuit breaker is open (the device recently kept failing)"""
+        return time.monotonic() >= self._open_until
+    
+    def warm_up(self):
+        """
+        Start talking to the device in the background, so the first real request
+        doesn't pay for the connection setup
+        
+        In an event loop this fetches the component list (opening a pooled connection and
+        filling the metadata cache); otherwise a thread opens and closes a plain TCP
+        connection, which at least resolves the device's address on both sides.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            threading.Thread(target=self._preconnect, daemon=True).start()
+            return
+        task = loop.create_task(self.get_components())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def _preconnect(self):
+        try:
+            socket.create_connection((self.host, self.port), timeout=WARM_UP_TIMEOUT_SEC).close()
+        except OSError as e:
+            logger.debug("[ESP32 %s] Pre-connect failed: %s", self.host, e)
+    
+    def _cached_meta(self, key: tuple) -> Any:
+        """Cached metadata result for key, or None if missing or older than META_CACHE_TTL_SEC"""
+        entry = self._meta_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < META_CACHE_TTL_SEC:
+            return entry[1]
+        return None
+    
+    def invalidate(self, comp: Optional[str] = None):
+        """Drop cached metadata for one component (and the component list), or everything"""
+        if comp is None:
+            self._meta_cache.clear()
+            return
+        for key in [k for k in self._meta_cache if k[0] == 'components' or k[1] == comp]:
+            del self._meta_cache[key]
+    
+    async def _fetch_meta(self, requests: Dict[tuple, Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Responses to metadata requests ({cache key: WebSocket request})
         
-    def get_components(self) -> List[str]:
-        """Get list of all components via GET /api/components"""
+        Fresh cached responses are reused; the rest are fetched over one device WebSocket
+        connection and cached for META_CACHE_TTL_SEC unless the device answered with an error.
+        """
+        results = {key: self._cached_meta(key) for key in requests}
+        missing = [key for key, result in results.items() if result is None]
+        if missing:
+            async with self._open_ws() as ws:
+                responses = await self._ws_batch(ws, [requests[key] for key in missing])
+            now = time.monotonic()
+            for key, response in zip(missing, responses):
+                results[key] = response
+                if response and 'error' not in response:
+                    self._meta_cache[key] = (now, response)
+        return results
+    
+    async def get_components(self) -> List[Any]:
+        """Get list of all components ({name, id} each) over the device WebSocket (cached)"""
+        key = ('components',)
         try:
-            response = self.session.get(f"{self.base_url}/api/components", timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            print(f"[ESP32 {self.host}] Components: {data}")
+            data = (await self._fetch_meta({key: {'type': 'get_components'}}))[key]
+            logger.debug("[ESP32 %s] Components: %s", self.host, data)
             return data.get("components", [])
         except Exception as e:
-            print(f"[ESP32 {self.host}] Error getting components: {e}")
+            logger.warning("[ESP32 %s] Error getting components: %s", self.host, e)
             return []
     
-    def get_param_info(self, component: str, param_type: str = None) -> Optional[Dict[str, Any]]:
+    async def ping(self) -> bool:
+        """Whether the device answers (a fresh cached component list also counts)"""
+        key = ('components',)
+        if self._cached_meta(key) is None:
+            await self.get_components()  # Only cached if the request succeeded
+        return self._cached_meta(key) is not None
+    
+    async def get_param_info(self, component: str, param_type: str = None) -> Optional[Dict[str, Any]]:
         """
-        Get parameter info for a component
-        GET /api/param_info?comp=ComponentName&type=int|float|bool|str|actions
+        Get parameter info for a component: {count} of its params of param_type
+        (int|float|bool|str|actions), over the device WebSocket (cached)
         """
+        key = ('param_info', component, param_type)
         try:
-            params = {'comp': component}
-            if param_type:
-                params['type'] = param_type
-            
-            response = self.session.get(f"{self.base_url}/api/param_info", params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            print(f"[ESP32 {self.host}] Param info for {component}/{param_type}: {data}")
-            return data
+            data = (await self._fetch_meta({key: {
+                'type': 'get_param_info', 'comp': component, 'param_type': param_type, 'idx': -1
+            }}))[key]
+            logger.debug("[ESP32 %s] Param info for %s/%s: %s", self.host, component, param_type, data)
+            return None if 'error' in data else data
         except Exception as e:
-            print(f"[ESP32 {self.host}] Error getting param info: {e}")
+            logger.warning("[ESP32 %s] Error getting param info: %s", self.host, e)
             return None
     
-    def get_param_value(self, comp: str, param_type: str, idx: int, row: int, col: int) -> Any:
+    async def get_overview(self, param_types) -> Tuple[List[Any], Dict[str, Dict[str, Any]]]:
+        """
+        The component list, and get_param_info for each component and each of param_types
+        
+        Returns (components, {component name: {param_type: info}}). Takes two WebSocket round
+        trips at most (one per connection), sharing the get_components/get_param_info cache.
+        Raises if the device can't be reached.
+        """
+        key = ('components',)
+        components = (await self._fetch_meta({key: {'type': 'get_components'}}))[key].get('components', [])
+        names = [comp.get('name') if isinstance(comp, dict) else comp for comp in components]
+        infos = await self._fetch_meta({
+            ('param_info', name, param_type): {
+                'type': 'get_param_info', 'comp': name, 'param_type': param_type, 'idx': -1
+            }
+            for name in names for param_type in param_types
+        })
+        return components, {
+            name: {param_type: infos[('param_info', name, param_type)] for param_type in param_types}
+            for name in names
+        }
+    
+    async def get_param_value(self, comp: str, param_type: str, idx: int, row: int, col: int) -> Any:
         """
         Get specific parameter value
-        GET /api/get_param?comp=X&type=Y&idx=0&row=0&col=0
+        
+        Calls made back-to-back (within BATCH_WINDOW_SEC) are coalesced into one
+        batch_get over the device WebSocket; a call on its own is a batch of one.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        op = {'op': 'get_param', 'comp': comp, 'type': param_type, 'idx': idx, 'row': row, 'col': col}
+        self._pending.append((op, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(BATCH_WINDOW_SEC, self._flush_pending)
+        return await future
+    
+    def _flush_pending(self):
+        """Send the get_param_value calls collected during the batch window"""
+        pending, self._pending = self._pending, []
+        self._flush_handle = None
+        task = asyncio.ensure_future(self._send_pending(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _send_pending(self, pending: List[tuple]):
+        """Fetch the values for a list of (op, future) and resolve the futures"""
+        results = await self.batch_get([op for op, _ in pending])
+        values = [result.get("value") if isinstance(result, dict) else None for result in results]
+        for (_, future), value in zip(pending, values):
+            if not future.done():
+                future.set_result(value)
+    
+    async def batch_get(self, ops: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run several parameter reads over one device WebSocket connection
+        
+        ops are {op, comp, type, idx, row, col}; returns one get_param response per op
+        ({..., value}), in order. The firmware's get_param finds parameters by id, so each
+        (comp, type, idx) not yet known is first resolved with get_param_info on the same
+        connection (ids are cached with the other metadata).
         """
         try:
-            params = {
-                'comp': comp,
-                'type': param_type,
-                'idx': idx,
-                'row': row,
-                'col': col
-            }
-            response = self.session.get(f"{self.base_url}/api/get_param", params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            print(f"[ESP32 {self.host}] Get param {comp}/{param_type}[{idx}][{row}][{col}]: {data}")
-            return data.get("value")
+            async with self._open_ws() as ws:
+                keys = [('param_id', op['comp'], op['type'], op['idx']) for op in ops]
+                missing = [key for key in dict.fromkeys(keys) if self._cached_meta(key) is None]
+                infos = await self._ws_batch(ws, [
+                    {'type': 'get_param_info', 'comp': comp, 'param_type': param_type, 'idx': idx}
+                    for _, comp, param_type, idx in missing
+                ])
+                now = time.monotonic()
+                for key, info in zip(missing, infos):
+                    if 'param_id' in info:
+                        self._meta_cache[key] = (now, info['param_id'])
+                
+                param_ids = [self._cached_meta(key) for key in keys]
+                found = [(i, param_id) for i, param_id in enumerate(param_ids) if param_id is not None]
+                values = await self._ws_batch(ws, [
+                    {'type': 'get_param', 'param_id': param_id, 'row': ops[i]['row'], 'col': ops[i]['col']}
+                    for i, param_id in found
+                ])
+            logger.debug("[ESP32 %s] Batch of %d: %s", self.host, len(ops), values)
+            results: List[Any] = [None] * len(ops)
+            for (i, _), value in zip(found, values):
+                results[i] = value
+            return results
         except Exception as e:
-            print(f"[ESP32 {self.host}] Error getting param value: {e}")
-            return None
+            logger.warning("[ESP32 %s] Error running batch: %s", self.host, e)
+            return [None] * len(ops)
     
-    def set_param_value(self, comp: str, param_type: str, idx: int, row: int, col: int, value: Any) -> bool:
+    async def set_param_value(self, comp: str, param_type: str, idx: int, row: int, col: int, value: Any) -> bool:
         """
         Set specific parameter value
         POST /api/set_param
@@ -85,16 +385,14 @@ class ESP32Device:
                 'col': col,
                 'value': value
             }
-            response = self.session.post(f"{self.base_url}/api/set_param", json=payload, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            print(f"[ESP32 {self.host}] Set param {comp}/{param_type}[{idx}][{row}][{col}]={value}: {data}")
+            data = await self._request_json('POST', '/api/set_param', json=payload)
+            logger.debug("[ESP32 %s] Set param %s/%s[%s][%s][%s]=%s: %s", self.host, comp, param_type, idx, row, col, value, data)
             return data.get("success", False)
         except Exception as e:
-            print(f"[ESP32 {self.host}] Error setting param value: {e}")
+            logger.warning("[ESP32 %s] Error setting param value: %s", self.host, e)
             return False
     
-    def invoke_action(self, comp: str, action: str) -> bool:
+    async def invoke_action(self, comp: str, action: str) -> bool:
         """
         Invoke component action
         POST /api/invoke_action
@@ -105,14 +403,70 @@ class ESP32Device:
                 'comp': comp,
                 'action': action
             }
-            response = self.session.post(f"{self.base_url}/api/invoke_action", json=payload, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            print(f"[ESP32 {self.host}] Invoke action {comp}/{action}: {data}")
+            data = await self._request_json('POST', '/api/invoke_action', json=payload)
+            # An action may reconfigure the component, so refetch its metadata next time
+            self.invalidate(comp)
+            logger.debug("[ESP32 %s] Invoke action %s/%s: %s", self.host, comp, action, data)
             return data.get("success", False)
         except Exception as e:
-            print(f"[ESP32 {self.host}] Error invoking action: {e}")
+            logger.warning("[ESP32 %s] Error invoking action: %s", self.host, e)
             return False
+    
+    async def stream_updates(self, components: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield live updates for every parameter cell of the given components
+        
+        Opens the device WebSocket (ws://host:port/ws), subscribes to each cell once and
+        yields its param_update pushes as {component, param_type, idx, row, col, value},
+        where idx is the parameter's index among the component's params of that type.
+        Runs until the connection closes or the caller stops iterating.
+        """
+        # Its own session: a long-lived stream must not hold the pool's one slot for the device
+        async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session, \
+                session.ws_connect(f"ws://{self.host}:{self.port}/ws") as ws:
+            # Parameter lists for all components in one request
+            await ws.send_json({
+                'type': 'batch',
+                'id': 0,
+                'msgs': [{'type': 'get_component_params', 'comp': comp} for comp in components]
+            }, dumps=_encode)
+            while True:
+                reply = await ws.receive_json(loads=orjson.loads)
+                if reply.get('id') == 0:
+                    break
+            
+            # param_id -> (component, param_type, idx), and every cell to subscribe to
+            params: Dict[int, Tuple[str, str, int]] = {}
+            cells = []
+            for comp, info in zip(components, reply.get('responses', [])):
+                type_counts: Dict[str, int] = {}
+                for param in info.get('params', []):
+                    param_type = param['type']
+                    idx = type_counts.get(param_type, 0)
+                    type_counts[param_type] = idx + 1
+                    params[param['id']] = (comp, param_type, idx)
+                    cells.extend({'type': 'subscribe', 'param_id': param['id'], 'row': row, 'col': col}
+                                 for row in range(param['rows']) for col in range(param['cols']))
+            
+            for i in range(0, len(cells), WS_BATCH_SIZE):
+                await ws.send_json({'type': 'batch', 'msgs': cells[i:i + WS_BATCH_SIZE]}, dumps=_encode)
+            logger.debug("[ESP32 %s] Streaming %d cells of %s", self.host, len(cells), components)
+            
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                update = orjson.loads(msg.data)
+                if update.get('type') != 'param_update' or update.get('param_id') not in params:
+                    continue  # Subscribe replies
+                comp, param_type, idx = params[update['param_id']]
+                yield {
+                    'component': comp,
+                    'param_type': param_type,
+                    'idx': idx,
+                    'row': update['row'],
+                    'col': update['col'],
+                    'value': update['value']
+                }
 
 
 class ESP32Manager:
@@ -120,13 +474,31 @@ class ESP32Manager:
     
     def __init__(self):
         self.devices: Dict[str, ESP32Device] = {}
-        
-    def add_device(self, name: str, host: str, port: int = 80) -> ESP32Device:
-        """Add a new ESP32 device (HTTP server on port 80 by default)"""
-        device = ESP32Device(host, port)
+    
+    def add_device(self, name: str, host: str, port: int = 80, base_url: Optional[str] = None) -> ESP32Device:
+        """Add a new ESP32 device (HTTP server on port 80 by default) and start warming it up"""
+        device = ESP32Device(host, port, base_url)
         self.devices[name] = device
+        device.warm_up()
         return device
     
+    def remove_device(self, name: str):
+        """Remove a device (no-op if it isn't registered)"""
+        self.devices.pop(name, None)
+    
+    def sync(self, registry: Dict[str, Dict[str, Any]]):
+        """
+        Match the managed devices to a registry of {name: {'host', 'port', ...}}.
+        
+        Devices whose host and port are unchanged keep their ESP32Device (and its caches).
+        """
+        for name in [n for n in self.devices if n not in registry]:
+            del self.devices[name]
+        for name, info in registry.items():
+            device = self.devices.get(name)
+            if device is None or device.host != info['host'] or device.port != info['port']:
+                self.add_device(name, info['host'], info['port'], info.get('base_url'))
+    
     def get_device(self, name: str) -> Optional[ESP32Device]:
         """Get device by name"""
         return self.devices.get(name)
@@ -134,6 +506,21 @@ class ESP32Manager:
     def get_all_devices(self) -> Dict[str, ESP32Device]:
         """Get all registered devices"""
         return self.devices
+    
+    async def map(self, method: str, *args, timeout: float = 5) -> Dict[str, Any]:
+        """
+        Call an ESP32Device method on every device concurrently
+        
+        Returns {name: result}; a call that raises or takes longer than timeout gives None.
+        Total latency is that of the slowest device, not the sum.
+        """
+        devices = list(self.devices.items())
+        results = await asyncio.gather(
+            *(asyncio.wait_for(getattr(device, method)(*args), timeout) for _, device in devices),
+            return_exceptions=True
+        )
+        return {name: None if isinstance(result, BaseException) else result
+                for (name, _), result in zip(devices, results)}
 
 
 # Global instance
@@ -0,0 +1,16 @@
+from django import forms
+from django.core.validators import RegexValidator
+
+from .converters import NAME_PATTERN
+
+
+class DeviceForm(forms.Form):
+    """Add-device form: validates and coerces the fields once, when the device is added"""
+    name = forms.CharField(max_length=64, validators=[RegexValidator(
+        f'^{NAME_PATTERN}$', 'Use letters, digits, "_" and "-" only.'
+    )])
+    host = forms.CharField(max_length=255)
+    port = forms.IntegerField(min_value=1, max_value=65535, required=False)
+
+    def clean_port(self):
+        return self.cleaned_data['port'] or 80  # Default HTTP port
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Device',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('host', models.CharField(max_length=255)),
+                ('port', models.PositiveIntegerField(default=80)),
+            ],
+        ),
+    ]
@@ -0,0 +1,11 @@
+from django.db import models
+
+
+class Device(models.Model):
+    """A registered ESP32 device (shared by every worker and kept across restarts)"""
+    name = models.CharField(max_length=64, unique=True)
+    host = models.CharField(max_length=255)
+    port = models.PositiveIntegerField(default=80)
+
+    def __str__(self):
+        return f"{self.name} ({self.host}:{self.port})"
@@ -1,12 +1,15 @@
-from django.urls import path
-from . import views
+from django.urls import path, register_converter
+from . import converters, views
 
+register_converter(converters.NameConverter, 'name')
+
+# Most requested pages first; message-builder must stay ahead of the component pattern
 urlpatterns = [
+    path('device/<name:device_name>/', views.device_view, name='device'),
+    path('device/<name:device_name>/message-builder/', views.message_builder, name='message_builder'),
+    path('device/<name:device_name>/<name:component_name>/', views.component_view, name='component'),
     path('', views.index, name='index'),
     path('add_device/', views.add_device, name='add_device'),
-    path('delete_device/<str:device_name>/', views.delete_device, name='delete_device'),
-    path('device/<str:device_name>/', views.device_view, name='device'),
-    path('device/<str:device_name>/message-builder/', views.message_builder, name='message_builder'),
-    path('device/<str:device_name>/<str:component_name>/', views.component_view, name='component'),
-    path('api/<str:device_name>/info/', views.get_device_info, name='api_device_info'),
+    path('delete_device/<name:device_name>/', views.delete_device, name='delete_device'),
+    path('api/<name:device_name>/info/', views.get_device_info, name='api_device_info'),
 ]
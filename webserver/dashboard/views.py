@@ -1,89 +1,214 @@
+import asyncio
+import functools
+import hashlib
+import time
+
+import orjson
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
-import json
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+
+from .esp32_client import esp32_manager
+from .forms import DeviceForm
+from .models import Device
+
+
+# Seconds a worker reuses its copy of the device registry before re-reading the database
+DEVICES_REFRESH_SEC = 5.0
+
+# How long the device list waits for devices to answer its status check
+DEVICE_STATUS_TIMEOUT_SEC = 2
 
+# How long browsers may reuse a device's info response without asking again
+DEVICE_INFO_MAX_AGE_SEC = 300
 
-# Simple in-memory device registry (just stores host/IP info)
+# Seconds a worker reuses a rendered device/component page (see cache_rendered)
+RENDERED_PAGE_TTL_SEC = 30
+RENDERED_PAGES_MAX = 256  # Oldest page is dropped beyond this (component names come from URLs)
+
+# Parameter types whose info device_view prefetches for each component
+PARAM_TYPES = ('int', 'float', 'bool', 'str', 'actions')
+
+# How long device_view waits for that prefetch before rendering without it
+DEVICE_PREFETCH_TIMEOUT_SEC = 1
+
+# Device registry: the Device table, with a per-process copy (name -> {name, host, port, base_url})
+# that is refreshed every DEVICES_REFRESH_SEC and updated directly by this worker's writes
 devices = {}
+_devices_loaded_at = None
+
+# Rendered pages: (view name, device name, *other view args, base_url) -> (rendered_at, html)
+_rendered_pages = {}
 
 
-def index(request):
-    """Main dashboard view - just lists devices"""
-    return render(request, 'dashboard/index.html', {'devices': devices})
+def _device_entry(name, host, port):
+    """
+    Registry entry for a device
+    
+    Derived values are built here once, not per request: base_url, and the encoded
+    get_device_info body (_json) with its ETag (_etag).
+    """
+    entry = {'name': name, 'host': host, 'port': port, 'base_url': f"http://{host}:{port}"}
+    entry['_json'] = orjson.dumps(entry)
+    entry['_etag'] = f'"{hashlib.blake2b(entry["_json"], digest_size=8).hexdigest()}"'
+    return entry
+
+
+def _read_devices():
+    """Read the device registry from the database (blocking; run off the event loop)"""
+    return {d['name']: _device_entry(d['name'], d['host'], d['port'])
+            for d in Device.objects.values('name', 'host', 'port')}
+
+
+async def _aget_devices():
+    """Get the device registry, re-reading the database if this worker's copy is stale"""
+    global devices, _devices_loaded_at
+    if _devices_loaded_at is not None and time.monotonic() - _devices_loaded_at < DEVICES_REFRESH_SEC:
+        return devices
+    loaded = await sync_to_async(_read_devices)()
+    devices, _devices_loaded_at = loaded, time.monotonic()
+    # Back on the event loop, so esp32_manager's devices never change under a running view
+    esp32_manager.sync(devices)
+    return devices
+
+
+async def index(request):
+    """Main dashboard view - lists devices, with whether each one is answering"""
+    devices = await _aget_devices()
+    online = await esp32_manager.map('ping', timeout=DEVICE_STATUS_TIMEOUT_SEC)
+    return render(request, 'dashboard/index.html', {
+        'devices': {name: {**device, 'online': bool(online.get(name))}
+                    for name, device in devices.items()}
+    })
 
 
-def add_device(request):
+async def add_device(request):
     """Add a new ESP32 device (just stores the IP/host info)"""
     if request.method == 'POST':
-        name = request.POST.get('name', '').strip()
-        host = request.POST.get('host', '').strip()
-        port = int(request.POST.get('port', 80))  # Default HTTP port
+        form = DeviceForm(request.POST)
         
-        if name and host:
-            devices[name] = {
-                'name': name,
-                'host': host,
-                'port': port
-            }
+        if form.is_valid():
+            name = form.cleaned_data['name']
+            host = form.cleaned_data['host']
+            port = form.cleaned_data['port']
+            await Device.objects.aupdate_or_create(name=name, defaults={'host': host, 'port': port})
+            entry = _device_entry(name, host, port)
+            (await _aget_devices())[name] = entry
+            _forget_pages(name)
+            esp32_manager.add_device(name, host, port, base_url=entry['base_url'])
         
         return redirect('index')
     
     return redirect('index')
 
 
-def delete_device(request, device_name):
+async def delete_device(request, device_name):
     """Delete an ESP32 device"""
     if request.method == 'POST':
-        if device_name in devices:
-            del devices[device_name]
+        await Device.objects.filter(name=device_name).adelete()
+        (await _aget_devices()).pop(device_name, None)
+        _forget_pages(device_name)
+        esp32_manager.remove_device(device_name)
     
     return redirect('index')
 
 
-def get_device_info(request, device_name):
-    """Get device connection info for client-side to use"""
-    if device_name in devices:
-        return JsonResponse(devices[device_name])
-    return JsonResponse({'error': 'Device not found'}, status=404)
+def require_device(view):
+    """Decorator: 404 unless device_name is registered, else pass its info to the view as device"""
+    @functools.wraps(view)
+    async def wrapper(request, device_name, *args, **kwargs):
+        device = (await _aget_devices()).get(device_name)
+        if device is None:
+            return JsonResponse({'error': 'Device not found'}, status=404)
+        return await view(request, device_name, *args, device=device, **kwargs)
+    return wrapper
 
 
-def device_view(request, device_name):
-    """View for a specific ESP32 device - shows list of components"""
-    if device_name not in devices:
-        return JsonResponse({'error': 'Device not found'}, status=404)
+def cache_rendered(view):
+    """
+    Decorator (inside require_device): reuse the view's HTML for RENDERED_PAGE_TTL_SEC
     
-    device_info = devices[device_name]
+    Pages are keyed on the device's base_url too, so a device whose address changes gets
+    fresh pages; add_device/delete_device drop a device's pages from this worker at once.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, device_name, *args, device, **kwargs):
+        key = (view.__name__, device_name, *args, *sorted(kwargs.items()), device['base_url'])
+        now = time.monotonic()
+        hit = _rendered_pages.get(key)
+        if hit is not None and now - hit[0] < RENDERED_PAGE_TTL_SEC:
+            return HttpResponse(hit[1])
+        response = await view(request, device_name, *args, device=device, **kwargs)
+        if response.status_code == 200:
+            _rendered_pages.pop(key, None)
+            if len(_rendered_pages) >= RENDERED_PAGES_MAX:
+                del _rendered_pages[next(iter(_rendered_pages))]
+            _rendered_pages[key] = (now, response.content)
+        return response
+    return wrapper
+
+
+def _forget_pages(device_name):
+    """Drop this worker's cached pages for a device"""
+    for key in [key for key in _rendered_pages if key[1] == device_name]:
+        del _rendered_pages[key]
+
+
+@require_device
+async def get_device_info(request, device_name, device):
+    """Get device connection info for client-side to use (cacheable, with an ETag)"""
+    etag = device['_etag']
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified(headers={'ETag': etag})
+    return HttpResponse(device['_json'], content_type='application/json', headers={
+        'ETag': etag,
+        'Cache-Control': f'max-age={DEVICE_INFO_MAX_AGE_SEC}',
+    })
+
+
+@require_device
+@cache_rendered
+async def device_view(request, device_name, device):
+    """
+    View for a specific ESP32 device - shows list of components
     
-    # Browser will fetch components directly from ESP32
+    The component list and every component's param info are prefetched over the device
+    WebSocket and embedded in the page (#bootstrap), so the browser renders without a round
+    trip per component. If the device doesn't answer within DEVICE_PREFETCH_TIMEOUT_SEC the
+    page renders without them, and asks the device directly.
+    """
+    try:
+        components, param_info = await asyncio.wait_for(
+            esp32_manager.get_device(device_name).get_overview(PARAM_TYPES),
+            DEVICE_PREFETCH_TIMEOUT_SEC
+        )
+    except Exception:
+        components, param_info = [], {}
     return render(request, 'dashboard/device.html', {
         'device_name': device_name,
-        'device': device_info,
-        'components': []  # Placeholder - JavaScript will fetch from ESP32
+        'device': device,
+        'bootstrap': {
+            'components': components,
+            'param_info': param_info,
+        },
     })
 
 
-def component_view(request, device_name, component_name):
+@require_device
+@cache_rendered
+async def component_view(request, device_name, component_name, device):
     """View for a specific component - shows actions and parameters"""
-    if device_name not in devices:
-        return JsonResponse({'error': 'Device not found'}, status=404)
-    
-    device_info = devices[device_name]
-    
     return render(request, 'dashboard/component.html', {
         'device_name': device_name,
         'component_name': component_name,
-        'device': device_info
+        'device': device
     })
 
 
-def message_builder(request, device_name):
+@require_device
+async def message_builder(request, device_name, device):
     """Message builder tool for creating WebSocket/executeMessage JSON"""
-    if device_name not in devices:
-        return JsonResponse({'error': 'Device not found'}, status=404)
-    
-    device_info = devices[device_name]
     return render(request, 'dashboard/message_builder.html', {
         'device_name': device_name,
-        'device': device_info
+        'device': device
     })
-
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
 """Django's command-line utility for administrative tasks."""
+import asyncio
 import os
 import sys
 
+try:
+    import uvloop  # Faster libuv-based event loop (optional, not on Windows)
+except ImportError:
+    uvloop = None
+
 
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'esp32_hub.settings')
+    if uvloop is not None:
+        # Before runserver imports daphne, which creates the server's event loop on import
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -7,6 +7,9 @@ let currentDevice = null;
 let currentComponent = null;
 let activeSubscriptions = [];  // Track active subscriptions for cleanup
 
+// Requests per batch frame - keeps each ESP32 response small enough for its heap
+const PARAM_BATCH_SIZE = 8;
+
 function showError(message, details = null) {
     const banner = document.getElementById('error-banner');
     if (banner) {
@@ -143,51 +146,29 @@ async function loadParameters(deviceName, componentName) {
     const container = document.getElementById('params-container');
     
     try {
-        // Get COUNTS first via WebSocket - one type at a time
-        console.log('[JS] Getting int param count...');
-        const intCount = (await esp32ws.getParamInfo(componentName, 'int', -1)).count || 0;
-        await new Promise(r => setTimeout(r, 100));
-        
-        console.log('[JS] Getting float param count...');
-        const floatCount = (await esp32ws.getParamInfo(componentName, 'float', -1)).count || 0;
-        await new Promise(r => setTimeout(r, 100));
-        
-        console.log('[JS] Getting bool param count...');
-        const boolCount = (await esp32ws.getParamInfo(componentName, 'bool', -1)).count || 0;
-        await new Promise(r => setTimeout(r, 100));
-        
-        console.log('[JS] Getting string param count...');
-        const strCount = (await esp32ws.getParamInfo(componentName, 'str', -1)).count || 0;
-        await new Promise(r => setTimeout(r, 100));
-        
-        // Now fetch each parameter ONE AT A TIME
-        const intParams = [];
-        for (let i = 0; i < intCount; i++) {
-            console.log(`[JS] Fetching int param ${i}...`);
-            intParams.push(await esp32ws.getParamInfo(componentName, 'int', i));
-            await new Promise(r => setTimeout(r, 100));
-        }
+        // Get COUNTS for every type in one batch
+        const types = ['int', 'float', 'bool', 'str'];
+        console.log('[JS] Getting param counts...');
+        const counts = await sendInBatches(types.map(param_type => (
+            { type: 'get_param_info', comp: componentName, param_type, idx: -1 }
+        )));
         
-        const floatParams = [];
-        for (let i = 0; i < floatCount; i++) {
-            console.log(`[JS] Fetching float param ${i}...`);
-            floatParams.push(await esp32ws.getParamInfo(componentName, 'float', i));
-            await new Promise(r => setTimeout(r, 100));
-        }
+        // Then every parameter's info, PARAM_BATCH_SIZE per frame
+        const infoRequests = [];
+        types.forEach((param_type, t) => {
+            for (let i = 0; i < (counts[t].count || 0); i++) {
+                infoRequests.push({ type: 'get_param_info', comp: componentName, param_type, idx: i });
+            }
+        });
+        console.log(`[JS] Fetching ${infoRequests.length} params...`);
+        const infos = await sendInBatches(infoRequests);
         
-        const boolParams = [];
-        for (let i = 0; i < boolCount; i++) {
-            console.log(`[JS] Fetching bool param ${i}...`);
-            boolParams.push(await esp32ws.getParamInfo(componentName, 'bool', i));
-            await new Promise(r => setTimeout(r, 100));
-        }
-        
-        const stringParams = [];
-        for (let i = 0; i < strCount; i++) {
-            console.log(`[JS] Fetching string param ${i}...`);
-            stringParams.push(await esp32ws.getParamInfo(componentName, 'str', i));
-            await new Promise(r => setTimeout(r, 100));
-        }
+        const paramsByType = { int: [], float: [], bool: [], str: [] };
+        infoRequests.forEach((req, i) => paramsByType[req.param_type].push(infos[i]));
+        const intParams = paramsByType.int;
+        const floatParams = paramsByType.float;
+        const boolParams = paramsByType.bool;
+        const stringParams = paramsByType.str;
         
         if (intParams.length === 0 && floatParams.length === 0 && 
             boolParams.length === 0 && stringParams.length === 0) {
@@ -195,13 +176,16 @@ async function loadParameters(deviceName, componentName) {
             return;
         }
         
+        // Subscribe to every cell (initial values + future updates), batched as well
+        const values = await subscribeAll(infos);
+        
         let html = '';
         
         // Integer parameters - use param.id for subscriptions
         if (intParams.length > 0) {
             html += '<div class="param-group"><h4>📊 Integer Parameters</h4>';
             for (const param of intParams) {
-                html += await createParamSectionById(deviceName, componentName, param);
+                html += createParamSectionById(deviceName, componentName, param, values);
             }
             html += '</div>';
         }
@@ -210,7 +194,7 @@ async function loadParameters(deviceName, componentName) {
         if (floatParams.length > 0) {
             html += '<div class="param-group"><h4>📈 Float Parameters</h4>';
             for (const param of floatParams) {
-                html += await createParamSectionById(deviceName, componentName, param);
+                html += createParamSectionById(deviceName, componentName, param, values);
             }
             html += '</div>';
         }
@@ -219,7 +203,7 @@ async function loadParameters(deviceName, componentName) {
         if (boolParams.length > 0) {
             html += '<div class="param-group"><h4>🔘 Boolean Parameters</h4>';
             for (const param of boolParams) {
-                html += await createParamSectionById(deviceName, componentName, param);
+                html += createParamSectionById(deviceName, componentName, param, values);
             }
             html += '</div>';
         }
@@ -228,7 +212,7 @@ async function loadParameters(deviceName, componentName) {
         if (stringParams.length > 0) {
             html += '<div class="param-group"><h4>📝 String Parameters</h4>';
             for (const param of stringParams) {
-                html += await createParamSectionById(deviceName, componentName, param);
+                html += createParamSectionById(deviceName, componentName, param, values);
             }
             html += '</div>';
         }
@@ -242,15 +226,70 @@ async function loadParameters(deviceName, componentName) {
     }
 }
 
+// Send requests as batch frames of PARAM_BATCH_SIZE; resolves to all responses in order.
+// Any inner error fails the whole call, as it would have for one-at-a-time requests.
+async function sendInBatches(requests) {
+    const responses = [];
+    for (let i = 0; i < requests.length; i += PARAM_BATCH_SIZE) {
+        const batch = await esp32ws.sendBatch(requests.slice(i, i + PARAM_BATCH_SIZE));
+        for (const response of batch) {
+            if (response.error) {
+                throw new Error(response.error);
+            }
+            responses.push(response);
+        }
+    }
+    return responses;
+}
+
+// Subscribe to every cell of the given params; returns their current values by cell key
+async function subscribeAll(params) {
+    const cells = [];
+    for (const { param_id, rows, cols } of params) {
+        for (let row = 0; row < rows; row++) {
+            for (let col = 0; col < cols; col++) {
+                cells.push({ param_id, row, col });
+            }
+        }
+    }
+    
+    const values = new Map();
+    for (let i = 0; i < cells.length; i += PARAM_BATCH_SIZE) {
+        const batch = cells.slice(i, i + PARAM_BATCH_SIZE);
+        let responses = [];
+        try {
+            responses = await esp32ws.sendBatch(batch.map(cell => ({ type: 'subscribe', ...cell })));
+        } catch (error) {
+            console.error('Error subscribing to params by ID:', error);
+        }
+        batch.forEach((cell, j) => {
+            const response = responses[j];
+            if (response && !response.error) {
+                // Track subscription for cleanup
+                activeSubscriptions.push(cell);
+                values.set(cellKey(cell.param_id, cell.row, cell.col),
+                           response.value !== null ? response.value : '');
+            } else {
+                values.set(cellKey(cell.param_id, cell.row, cell.col), '');
+            }
+        });
+    }
+    return values;
+}
+
+function cellKey(paramId, row, col) {
+    return `${paramId}_${row}_${col}`;
+}
+
 // Create param section using param.param_id for subscriptions and updates
-async function createParamSectionById(deviceName, component, param) {
+function createParamSectionById(deviceName, component, param, values) {
     const { name, param_id: paramId, type, rows, cols, min, max, readOnly } = param;
     
     let html = '';
     
     for (let r = 0; r < rows; r++) {
         for (let c = 0; c < cols; c++) {
-            const value = await getParamValueById(paramId, r, c);
+            const value = values.get(cellKey(paramId, r, c));
             const inputId = `param_${paramId}_${r}_${c}`;
             
             // Add read-only class if parameter is read-only
@@ -300,25 +339,6 @@ async function createParamSectionById(deviceName, component, param) {
     return html;
 }
 
-// Get param value by ID and subscribe for updates
-async function getParamValueById(paramId, row, col) {
-    try {
-        // Subscribe to get initial value and future updates
-        const value = await esp32ws.subscribeById(paramId, row, col);
-        
-        // Track subscription for cleanup
-        activeSubscriptions.push({ param_id: paramId, row, col });
-        
-        // Small delay to avoid overwhelming ESP32
-        await new Promise(r => setTimeout(r, 50));
-        
-        return value !== null ? value : '';
-    } catch (error) {
-        console.error('Error subscribing to param by ID:', error);
-        return '';
-    }
-}
-
 // Sync functions for slider/number inputs
 function syncNumberInput(inputId, value) {
     document.getElementById(inputId).value = value;
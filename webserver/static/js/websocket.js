@@ -28,21 +28,13 @@ class ESP32WebSocket {
             this.ws.onmessage = (event) => {
                 console.log('WebSocket received:', event.data);
                 try {
-                    const response = JSON.parse(event.data);
+                    const data = JSON.parse(event.data);
                     
-                    // If response has an id, it's a reply to a request
-                    if (response.id !== undefined && this.pendingRequests.has(response.id)) {
-                        const { resolve, reject } = this.pendingRequests.get(response.id);
-                        this.pendingRequests.delete(response.id);
-                        
-                        if (response.error) {
-                            reject(new Error(response.error));
-                        } else {
-                            resolve(response);
-                        }
+                    // The central hub merges queued messages into one frame
+                    if (data.type === 'batch' && Array.isArray(data.msgs)) {
+                        data.msgs.forEach(msg => this.handleMessage(msg));
                     } else {
-                        // Unsolicited message from server (push notification)
-                        this.handlePushMessage(response);
+                        this.handleMessage(data);
                     }
                 } catch (error) {
                     console.error('Failed to parse WebSocket message:', error);
@@ -70,6 +62,26 @@ class ESP32WebSocket {
         });
     }
 
+    handleMessage(response) {
+        // Keepalive from the central hub; nothing to do
+        if (response.type === 'ping') return;
+        
+        // If response has an id, it's a reply to a request
+        if (response.id !== undefined && this.pendingRequests.has(response.id)) {
+            const { resolve, reject } = this.pendingRequests.get(response.id);
+            this.pendingRequests.delete(response.id);
+            
+            if (response.error) {
+                reject(new Error(response.error));
+            } else {
+                resolve(response);
+            }
+        } else {
+            // Unsolicited message from server (push notification)
+            this.handlePushMessage(response);
+        }
+    }
+
     send(message) {
         return new Promise((resolve, reject) => {
             if (!this.connected || !this.ws) {
@@ -165,6 +177,16 @@ class ESP32WebSocket {
         return response.success;
     }
 
+    // Send several requests in one {"type":"batch"} frame. Resolves to their responses,
+    // in request order; an inner error comes back as {error: ...} rather than rejecting.
+    async sendBatch(messages) {
+        const response = await this.send({
+            type: 'batch',
+            msgs: messages
+        });
+        return response.responses || [];
+    }
+
     // Old API method - still needed for one-at-a-time fetching to avoid overwhelming ESP32
     async getParamInfo(comp, param_type, idx = -1) {
         const response = await this.send({